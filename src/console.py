@@ -9,7 +9,7 @@ from rich.logging import RichHandler
 from rich.panel import Panel
 from rich.text import Text
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-from rich.table import Table
+from rich.table import Table, Column
 from rich.syntax import Syntax
 from rich.highlighter import ReprHighlighter
 from rich.tree import Tree
@@ -18,12 +18,19 @@ from rich.console import Group
 from rich.rule import Rule
 from rich.layout import Layout
 from rich.align import Align
-from rich.padding import Padding
 from rich.spinner import Spinner
+from rich.style import Style
+import json
 import logging
+import re
 import sys
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Create a global console instance with highlighting
 console = Console(highlighter=ReprHighlighter())
 
@@ -32,6 +39,54 @@ _page_live: Live | None = None
 _current_domain: str = "unknown"
 _current_url: str = ""
 _queue_progress_data: dict = {"processed": 0, "total": 0}
+# Finished page trees available for reuse by the next page
+_TREE_POOL: list = []
+
+# Panels render as multi-line box art; use single-line text when output is redirected
+_USE_PANELS = console.is_terminal
+
+# Plain single-line messages can skip Rich's markup/render pipeline on capable terminals
+_ANSI_FAST_PATH = (console.is_terminal and not console.legacy_windows
+                   and console.color_system in ("256", "truecolor"))
+_ANSI_RESET = "\x1b[0m"
+_ANSI_BOLD_GREEN = "\x1b[1;92m"
+_ANSI_BOLD_RED = "\x1b[1;91m"
+_ANSI_BOLD_YELLOW = "\x1b[1;93m"
+_ANSI_BOLD_BLUE = "\x1b[1;94m"
+_ANSI_BOLD_CYAN = "\x1b[1;96m"
+_ANSI_BOLD_PURPLE = "\x1b[1;38;5;129m"
+_ANSI_BOLD_DARK_CYAN = "\x1b[1;36m"
+
+# Styles used on the per-page render path, parsed once instead of on every refresh
+_STYLE_DIM = Style.parse("dim")
+_STYLE_WHITE = Style.parse("white")
+_STYLE_DIM_WHITE = Style.parse("dim white")
+_STYLE_DIM_BRIGHT_WHITE = Style.parse("dim bright_white")
+_STYLE_BOLD_BRIGHT_GREEN = Style.parse("bold bright_green")
+_STYLE_BRIGHT_GREEN = Style.parse("bright_green")
+_STYLE_BOLD_GREEN = Style.parse("bold green")
+_STYLE_BOLD_BRIGHT_MAGENTA = Style.parse("bold bright_magenta")
+_STYLE_BRIGHT_MAGENTA = Style.parse("bright_magenta")
+_STYLE_BOLD_BRIGHT_CYAN = Style.parse("bold bright_cyan")
+_STYLE_BRIGHT_BLUE = Style.parse("bright_blue")
+_STYLE_BRIGHT_WHITE = Style.parse("bright_white")
+_STYLE_GREY70 = Style.parse("grey70")
+_STYLE_GREY58 = Style.parse("grey58")
+_STYLE_GREY50 = Style.parse("grey50")
+_STYLE_BLUE = Style.parse("blue")
+_STYLE_YELLOW = Style.parse("yellow")
+_STYLE_CYAN = Style.parse("cyan")
+_STYLE_BOLD_MAGENTA = Style.parse("bold magenta")
+
+# Matches the "(in 1.23s)" timing suffix of file saved messages
+_TIMING_RE = re.compile(r"\((?:in\s+)?\d+(?:\.\d+)?s\)")
+
+# Column specs for the queue progress table (label, bar, count), built once and copied per table
+_PROGRESS_COLUMNS = (
+    Column(width=20),
+    Column(ratio=1),
+    Column(justify="right", width=12),
+)
 
 def print_app_title():
     """Print the application title at the very top."""
@@ -54,25 +109,32 @@ def setup_rich_logging():
         handlers=[RichHandler(console=console, show_path=False)]
     )
 
+def _print_styled(text: str, style: str, ansi: str):
+    """Print a single styled line, writing ANSI directly when no markup or live display is involved."""
+    if _ANSI_FAST_PATH and _page_live is None and "[" not in text:
+        console.file.write(f"{ansi}{text}{_ANSI_RESET}\n")
+    else:
+        console.print(text, style=style)
+
 def print_success(message: str):
     """Print a success message with green styling."""
-    console.print(f"✅ {message}", style="bold bright_green")
+    _print_styled(f"✅ {message}", "bold bright_green", _ANSI_BOLD_GREEN)
 
 def print_error(message: str):
     """Print an error message with red styling."""
-    console.print(f"❌ {message}", style="bold bright_red")
+    _print_styled(f"❌ {message}", "bold bright_red", _ANSI_BOLD_RED)
 
 def print_warning(message: str):
     """Print a warning message with yellow styling."""
-    console.print(f"⚠️ {message}", style="bold bright_yellow")
+    _print_styled(f"⚠️ {message}", "bold bright_yellow", _ANSI_BOLD_YELLOW)
 
 def print_info(message: str):
     """Print an info message with blue styling."""
-    console.print(f"ℹ️ {message}", style="bold bright_blue")
+    _print_styled(f"ℹ️ {message}", "bold bright_blue", _ANSI_BOLD_BLUE)
 
 def print_processing(message: str):
     """Print a processing message with cyan styling."""
-    console.print(f"🔄 {message}", style="bold bright_cyan")
+    _print_styled(f"🔄 {message}", "bold bright_cyan", _ANSI_BOLD_CYAN)
 
 def print_url(url: str):
     """Print a URL with special highlighting."""
@@ -91,11 +153,11 @@ def print_progress_step(step: str, current: int, total: int):
 
 def print_semantic_processing(message: str):
     """Print semantic processing message with special styling."""
-    console.print(f"🧠 {message}", style="bold purple")
+    _print_styled(f"🧠 {message}", "bold purple", _ANSI_BOLD_PURPLE)
 
 def print_rag_upload(message: str):
     """Print RAG upload message with special styling."""
-    console.print(f"📤 {message}", style="bold cyan")
+    _print_styled(f"📤 {message}", "bold cyan", _ANSI_BOLD_DARK_CYAN)
 
 def print_panel(title: str, content: str, style: str = "blue"):
     """Print content in a compact, panel-like block without heavy borders."""
@@ -142,17 +204,24 @@ def print_syntax(code: str, language: str = "python"):
     syntax = Syntax(code, language, theme="monokai", line_numbers=True)
     console.print(syntax)
 
+def _dumps_indented(data) -> str:
+    """Serialize data as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2)
+
 def print_json(data: dict):
-    """Print JSON data with syntax highlighting."""
-    import json
-    json_str = json.dumps(data, indent=2)
+    """Print JSON data with syntax highlighting (plain text when output is redirected)."""
+    json_str = _dumps_indented(data)
+    if not console.is_terminal:
+        console.file.write(json_str + "\n")
+        return
     syntax = Syntax(json_str, "json", theme="monokai")
     console.print(syntax)
 
 def _get_checkpoint_counts():
     """Get current processed and remaining counts from checkpoint file."""
     try:
-        import json
         with open('crawler_checkpoint.json', 'r', encoding='utf-8') as f:
             cp = json.load(f)
         queue = cp.get('crawl_queue', []) or []
@@ -173,7 +242,6 @@ def _get_checkpoint_counts():
 def _create_checkpoint_status():
     """Create checkpoint status display."""
     try:
-        import json
         with open('crawler_checkpoint.json', 'r', encoding='utf-8') as f:
             cp = json.load(f)
         
@@ -184,35 +252,43 @@ def _create_checkpoint_status():
         semantic_tasks = 0  # You may need to adjust this based on how semantic tasks are tracked
         
         status_text = Text()
-        status_text.append("📥 ", style="dim")
-        status_text.append(f"Loaded checkpoint with {visited_count} visited URLs, {semantic_tasks} semantic tasks", style="dim")
+        status_text.append("📥 ", style=_STYLE_DIM)
+        status_text.append(f"Loaded checkpoint with {visited_count} visited URLs, {semantic_tasks} semantic tasks", style=_STYLE_DIM)
         
         return status_text
     except Exception:
-        return Text("📥 No checkpoint found", style="dim")
+        return Text("📥 No checkpoint found", style=_STYLE_DIM)
+
+def _make_progress_table() -> Table:
+    """Create a fresh queue progress table from the precomputed column specs."""
+    return Table(
+        *(column.copy() for column in _PROGRESS_COLUMNS),
+        show_header=False,
+        box=None,
+        expand=True,
+        padding=(0, 1)
+    )
 
 def _create_queue_progress():
     """Create the queue progress display."""
-    processed, remaining = _get_checkpoint_counts()
-    total = processed + remaining
+    if _queue_progress_data["total"] > 0:
+        # Running counters supplied by the crawler for the current page
+        processed = _queue_progress_data["processed"]
+        total = _queue_progress_data["total"]
+    else:
+        # Fall back to the last saved checkpoint
+        processed, remaining = _get_checkpoint_counts()
+        total = processed + remaining
     
     if total == 0:
         # Return empty panel to maintain layout
         empty_table = Table(show_header=False, box=None, expand=True, padding=(0, 1))
         empty_table.add_column()
-        empty_table.add_row(Text("No queue data", style="dim"))
-        return Panel(empty_table, box=box.ROUNDED, border_style="dim", padding=(0, 1))
+        empty_table.add_row(Text("No queue data", style=_STYLE_DIM))
+        return Panel(empty_table, box=box.ROUNDED, border_style=_STYLE_DIM, padding=(0, 1))
     
     # Create progress bar table (1 row x 3 columns)
-    progress_table = Table(
-        show_header=False,
-        box=None,
-        expand=True,
-        padding=(0, 1)
-    )
-    progress_table.add_column(width=20)  # Label column
-    progress_table.add_column(ratio=1)   # Progress bar column
-    progress_table.add_column(justify="right", width=12)  # Count column
+    progress_table = _make_progress_table()
     
     # Calculate available width dynamically (console width - label - count - padding)
     try:
@@ -224,33 +300,31 @@ def _create_queue_progress():
     
     # Create progress bar to fill available space
     bar_width = available_width - 2  # Subtract 2 for brackets
-    progress_ratio = processed / total
-    filled_width = int(bar_width * progress_ratio)
+    filled_width = min(bar_width, (bar_width * processed) // total)
     empty_width = bar_width - filled_width
     
     # Label text
-    label_text = Text("📊 Queue Progress", style="bold bright_magenta")
+    label_text = Text("📊 Queue Progress", style=_STYLE_BOLD_BRIGHT_MAGENTA)
     
     # Progress bar text that fills the column
     progress_text = Text()
-    progress_text.append("[", style="dim white")
-    progress_text.append("█" * filled_width, style="bold bright_green")
-    progress_text.append("░" * empty_width, style="dim white")
-    progress_text.append("]", style="dim white")
+    progress_text.append("[", style=_STYLE_DIM_WHITE)
+    progress_text.append("█" * filled_width, style=_STYLE_BOLD_BRIGHT_GREEN)
+    progress_text.append("░" * empty_width, style=_STYLE_DIM_WHITE)
+    progress_text.append("]", style=_STYLE_DIM_WHITE)
     
     # Count text
-    count_text = Text(f"{processed}/{total}", style="dim bright_white")
+    count_text = Text(f"{processed}/{total}", style=_STYLE_DIM_BRIGHT_WHITE)
     
     # Add row to table
     progress_table.add_row(label_text, progress_text, count_text)
     
     # Wrap in a panel with rounded top corners
-    return Panel(progress_table, box=box.ROUNDED, border_style="bright_blue", padding=(0, 1))
+    return Panel(progress_table, box=box.ROUNDED, border_style=_STYLE_BRIGHT_BLUE, padding=(0, 1))
 
 def _create_upcoming_urls():
     """Create the upcoming URLs panel."""
     try:
-        import json
         with open('crawler_checkpoint.json', 'r', encoding='utf-8') as f:
             cp = json.load(f)
         queue = cp.get('crawl_queue', []) or []
@@ -262,7 +336,7 @@ def _create_upcoming_urls():
     
     # Create table with numbering
     table = Table.grid(expand=True, padding=(0,0))
-    table.add_column(width=3, justify="right", style="dim", no_wrap=True)  # Number column
+    table.add_column(width=3, justify="right", style=_STYLE_DIM, no_wrap=True)  # Number column
     table.add_column(ratio=1, no_wrap=True, overflow="ellipsis")  # URL column
     
     if urls:
@@ -283,23 +357,22 @@ def _create_upcoming_urls():
                 row = Table.grid(padding=(0,0))
                 row.add_column(width=2, no_wrap=True)
                 row.add_column(ratio=1)
-                row.add_row(Spinner('dots', style='grey70'), Text(shortened, style="grey70"))
-                table.add_row(Text(f"{idx+1}.", style="dim"), row)
+                row.add_row(Spinner('dots', style=_STYLE_GREY70), Text(shortened, style=_STYLE_GREY70))
+                table.add_row(Text(f"{idx+1}.", style=_STYLE_DIM), row)
             else:
-                table.add_row(Text(f"{idx+1}.", style="dim"), Text(shortened, style="grey70"))
+                table.add_row(Text(f"{idx+1}.", style=_STYLE_DIM), Text(shortened, style=_STYLE_GREY70))
     else:
-        table.add_row("", Text("(queue empty)", style="grey58"))
+        table.add_row("", Text("(queue empty)", style=_STYLE_GREY58))
     
     # Add "more" footer
     if remaining > 0:
-        table.add_row("", Text(f"+ {remaining} more", style="grey58"))
+        table.add_row("", Text(f"+ {remaining} more", style=_STYLE_GREY58))
     
-    return Panel(table, title="Upcoming URLs", title_align="left", border_style="grey50", padding=(1,1))
+    return Panel(table, title="Upcoming URLs", title_align="left", border_style=_STYLE_GREY50, padding=(1,1))
 
 def _get_next_url_from_queue():
     """Get the first URL from the crawl queue."""
     try:
-        import json
         with open('crawler_checkpoint.json', 'r', encoding='utf-8') as f:
             cp = json.load(f)
         queue = cp.get('crawl_queue', []) or []
@@ -330,19 +403,19 @@ def _create_header():
     # Get next URL from queue instead of current processing URL
     next_url = _get_next_url_from_queue()
     url_display = next_url or _current_domain or "(queue empty)"
-    url_text = Text(ellipsize_right(str(url_display), max_url_len), style="bold bright_cyan", no_wrap=True, overflow="ellipsis")
+    url_text = Text(ellipsize_right(str(url_display), max_url_len), style=_STYLE_BOLD_BRIGHT_CYAN, no_wrap=True, overflow="ellipsis")
     
     left_grid.add_row(
-        Spinner('dots', style='bright_magenta'),
+        Spinner('dots', style=_STYLE_BRIGHT_MAGENTA),
         Text("🌐", no_wrap=True),
         url_text,
     )
     
     # Right side: clock
-    clock_text = Text(datetime.now().strftime("%H:%M:%S"), style="dim")
+    clock_text = Text(datetime.now().strftime("%H:%M:%S"), style=_STYLE_DIM)
     
     header_table.add_row(left_grid, clock_text)
-    return Panel(header_table, border_style="bright_magenta", padding=(0,1))
+    return Panel(header_table, border_style=_STYLE_BRIGHT_MAGENTA, padding=(0,1))
 
 def _create_layout_content(tree: Tree):
     """Create the complete layout content within Live update region."""
@@ -354,12 +427,12 @@ def _create_layout_content(tree: Tree):
     header = _create_header()
     
     # Create body panels
-    body_left = Panel(tree, border_style="white", padding=(1,1))
+    body_left = Panel(tree, border_style=_STYLE_WHITE, padding=(1,1))
     body_right = _create_upcoming_urls()
     
     # Create footer
-    hint_rule = Rule(style="dim")
-    hint_text = Align.center(Text("Press Ctrl+C to quit", style="dim"))
+    hint_rule = Rule(style=_STYLE_DIM)
+    hint_text = Align.center(Text("Press Ctrl+C to quit", style=_STYLE_DIM))
     footer = Group(hint_rule, hint_text)
     
     # Main layout structure: queue, header, body, footer (removed checkpoint)
@@ -381,20 +454,35 @@ def _create_layout_content(tree: Tree):
     
     return layout
 
-def create_page_processing_tree(page_num: int, queue_size: int, domain: str, url: str) -> Tree:
-    """Create a rich tree for page processing with panels and enhanced colors."""
+def create_page_processing_tree(page_num: int, queue_size: int, domain: str, url: str,
+                                *, total_pages: int = None) -> Tree:
+    """Create a rich tree for page processing with panels and enhanced colors.
+    
+    When ``total_pages`` is given the queue progress bar tracks ``page_num``
+    against it; otherwise it falls back to the counts in the checkpoint file.
+    """
     global _current_domain, _current_url, _page_live
     
     # Update global state
     _current_domain = domain
     _current_url = str(url)
+    if total_pages:
+        _queue_progress_data["processed"] = page_num
+        _queue_progress_data["total"] = max(total_pages, page_num)
+    else:
+        _queue_progress_data["processed"] = 0
+        _queue_progress_data["total"] = 0
     
-    # Create main tree
-    tree = Tree(
-        label="",
-        guide_style="bright_white",
-        hide_root=True
-    )
+    # Reuse a finished page tree if one is available, otherwise create the main tree
+    if _TREE_POOL:
+        tree = _TREE_POOL.pop()
+        tree.children.clear()
+    else:
+        tree = Tree(
+            label="",
+            guide_style=_STYLE_BRIGHT_WHITE,
+            hide_root=True
+        )
     
     # Set tree as current parent for adding steps
     setattr(tree, "_current_parent", tree)
@@ -417,23 +505,23 @@ def add_processing_step(tree: Tree, step_type: str, message: str, style: str = "
     parent = getattr(tree, "_current_parent", tree)
     
     if step_type == "success":
-        step_text.append(message, style="bold green")
+        step_text.append(message, style=_STYLE_BOLD_GREEN)
     elif step_type == "info":
-        step_text.append(message, style="blue")
+        step_text.append(message, style=_STYLE_BLUE)
     elif step_type == "warning":
         # Check if this is a duplicate removal message and add padding
         if "duplicate" in message.lower():
             # Add vertical padding before
-            parent.add(Text(" ", style="dim"))
-            step_text.append(message, style="yellow")
+            parent.add(Text(" ", style=_STYLE_DIM))
+            step_text.append(message, style=_STYLE_YELLOW)
             node = parent.add(step_text)
             # Add vertical padding after
-            parent.add(Text(" ", style="dim"))
+            parent.add(Text(" ", style=_STYLE_DIM))
             # Update live display (reduced frequency to prevent duplicates)
             if _page_live is not None:
                 try:
                     # Only update the tree content without recreating the entire layout
-                    body_left = Panel(tree, border_style="white", padding=(1,1))
+                    body_left = Panel(tree, border_style=_STYLE_WHITE, padding=(1,1))
                     _page_live.layout["body"]["left"].update(body_left)
                     _page_live.refresh()
                 except Exception:
@@ -442,14 +530,13 @@ def add_processing_step(tree: Tree, step_type: str, message: str, style: str = "
                     _page_live.update(layout, refresh=True)
             return node
         else:
-            step_text.append(message, style="yellow")
+            step_text.append(message, style=_STYLE_YELLOW)
     elif step_type == "processing":
-        step_text.append(message, style="cyan")
+        step_text.append(message, style=_STYLE_CYAN)
     elif step_type == "semantic":
-        step_text.append(message, style="bold magenta")
+        step_text.append(message, style=_STYLE_BOLD_MAGENTA)
     elif step_type == "file":
         # Handle file saved messages
-        import re
         if "HTML" in message:
             label = "HTML saved"
         elif "MARKDOWN" in message:
@@ -460,7 +547,7 @@ def add_processing_step(tree: Tree, step_type: str, message: str, style: str = "
             label = "File saved"
         
         # Extract timing
-        timing_match = re.search(r"\((?:in\s+)?\d+(?:\.\d+)?s\)", message)
+        timing_match = _TIMING_RE.search(message)
         timing = timing_match.group(0) if timing_match else ""
         
         # Create file saved display
@@ -469,17 +556,17 @@ def add_processing_step(tree: Tree, step_type: str, message: str, style: str = "
         file_table.add_column(justify="right", width=12, no_wrap=True)
         
         left_text = Text()
-        left_text.append("💾 ", style="bright_green")
-        left_text.append(label, style="bold green")
+        left_text.append("💾 ", style=_STYLE_BRIGHT_GREEN)
+        left_text.append(label, style=_STYLE_BOLD_GREEN)
         
-        file_table.add_row(left_text, Text(timing, style="dim") if timing else "")
+        file_table.add_row(left_text, Text(timing, style=_STYLE_DIM) if timing else "")
         node = parent.add(file_table)
         
         # Update live display (reduced frequency to prevent duplicates)
         if _page_live is not None:
             try:
                 # Only update the tree content without recreating the entire layout
-                body_left = Panel(tree, border_style="white", padding=(1,1))
+                body_left = Panel(tree, border_style=_STYLE_WHITE, padding=(1,1))
                 _page_live.layout["body"]["left"].update(body_left)
                 _page_live.refresh()
             except Exception:
@@ -497,7 +584,7 @@ def add_processing_step(tree: Tree, step_type: str, message: str, style: str = "
     if _page_live is not None:
         try:
             # Only update the tree content without recreating the entire layout
-            body_left = Panel(tree, border_style="white", padding=(1,1))
+            body_left = Panel(tree, border_style=_STYLE_WHITE, padding=(1,1))
             _page_live.layout["body"]["left"].update(body_left)
             _page_live.refresh()
         except Exception:
@@ -514,26 +601,31 @@ def print_processing_tree_final(tree: Tree, page_num: int, domain: str = "unknow
     
     parent = getattr(tree, "_current_parent", tree)
     
-    # Add completion message with padding
-    parent.add(Text(" ", style="dim"))
+    # Add completion message with padding as a single node so it renders in one pass
     completion_text = Text()
-    completion_text.append("🎉 ", style="bold bright_green")
-    completion_text.append(f"Page {page_num} completed successfully!", style="bold bright_green")
-    completion_panel = Panel(completion_text, border_style="bright_green", padding=(0,1))
-    parent.add(completion_panel)
-    parent.add(Text(" ", style="dim"))
+    completion_text.append("🎉 ", style=_STYLE_BOLD_BRIGHT_GREEN)
+    completion_text.append(f"Page {page_num} completed successfully!", style=_STYLE_BOLD_BRIGHT_GREEN)
+    if _USE_PANELS:
+        completion_text = Panel(completion_text, border_style=_STYLE_BRIGHT_GREEN, padding=(0,1))
+    parent.add(Group(Text(" ", style=_STYLE_DIM), completion_text, Text(" ", style=_STYLE_DIM)))
     
     # Update live display (reduced frequency to prevent duplicates)
     if _page_live is not None:
         try:
             # Only update the tree content without recreating the entire layout
-            body_left = Panel(tree, border_style="white", padding=(1,1))
+            body_left = Panel(tree, border_style=_STYLE_WHITE, padding=(1,1))
             _page_live.layout["body"]["left"].update(body_left)
             _page_live.refresh()
         except Exception:
             # Fallback to full layout update if partial update fails
             layout = _create_layout_content(tree)
             _page_live.update(layout, refresh=True)
+    
+    # Keep showing the finished tree; it is cleared when the next page reuses it.
+    # A page finalized twice (e.g. on an error path) must not be pooled twice, or two
+    # later pages would share and mutate the same tree
+    if not any(pooled is tree for pooled in _TREE_POOL):
+        _TREE_POOL.append(tree)
 
 def stop_page_live():
     """Stop and clear the persistent live page panel."""
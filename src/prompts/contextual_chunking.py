@@ -1,39 +1,9 @@
-class ContextualChunking:
-    def __init__(self, document_path: str, document_content: str = None):
-        """
-        Initialize with document path and optionally load content
-        
-        Args:
-            document_path: Path to the document to chunk
-            document_content: Optional pre-loaded document content
-        """
-        if document_content is not None:
-            self.document_content = document_content
-        else:
-            # Try multiple encodings to handle various file formats
-            encodings = ['utf-8', 'iso-8859-1', 'windows-1252', 'cp1252']
-            content = None
-            
-            for encoding in encodings:
-                try:
-                    with open(document_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if content is None:
-                # If all encodings fail, use utf-8 with error replacement
-                with open(document_path, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read()
-            
-            self.document_content = content
-    
-    def get_full_prompt(self):
-        """
-        Returns the prompt for contextual chunking with document content
-        """
-        prompt_template = """
+import codecs
+import os
+
+
+# Contextual chunking prompt; the document is inserted at DOCUMENT_CONTENT_PLACEHOLDER
+_PROMPT_TEMPLATE = """
 TASK:
 
 **Semantic Chunking:** 
@@ -133,5 +103,81 @@ DOCUMENT_CONTENT_PLACEHOLDER
 </document> 
 
         """
+
+# Split once at import so each prompt is built by concatenation rather than str.replace
+_PROMPT_PREFIX, _PROMPT_SUFFIX = _PROMPT_TEMPLATE.split("DOCUMENT_CONTENT_PLACEHOLDER", 1)
+
+# Byte order marks and their codecs; UTF-32 first since its LE mark starts with UTF-16's
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+
+class ContextualChunking:
+    def __init__(self, document_path: str, document_content: str = None):
+        """
+        Initialize with document path and optionally load content
         
-        return prompt_template.replace("DOCUMENT_CONTENT_PLACEHOLDER", self.document_content)
\ No newline at end of file
+        Args:
+            document_path: Path to the document to chunk
+            document_content: Optional pre-loaded document content
+        """
+        if document_content is not None:
+            self.document_content = document_content
+        else:
+            # Read the file once, sized from fstat and without Python's buffered IO layer,
+            # then try multiple encodings in memory
+            fd = os.open(document_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                size = os.fstat(fd).st_size
+                raw = os.read(fd, size)
+                # Short reads are possible for very large files; read until EOF
+                while len(raw) < size:
+                    more = os.read(fd, size - len(raw))
+                    if not more:
+                        break
+                    raw += more
+            finally:
+                os.close(fd)
+            
+            content = None
+            
+            # A BOM identifies the encoding outright, and pure ASCII is valid UTF-8,
+            # so the common cases skip the exception-driven fallback chain
+            for bom, encoding in _BOM_ENCODINGS:
+                if raw.startswith(bom):
+                    try:
+                        content = raw[len(bom):].decode(encoding)
+                    except UnicodeDecodeError:
+                        pass
+                    break
+            else:
+                if raw.isascii():
+                    content = raw.decode('ascii')
+            
+            if content is None:
+                encodings = ['utf-8', 'iso-8859-1', 'windows-1252', 'cp1252']
+                
+                for encoding in encodings:
+                    try:
+                        content = raw.decode(encoding)
+                        break
+                    except UnicodeDecodeError:
+                        continue
+            
+            if content is None:
+                # If all encodings fail, use utf-8 with error replacement
+                content = raw.decode('utf-8', errors='replace')
+            
+            # Normalize newlines as text-mode reading did
+            self.document_content = content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    def get_full_prompt(self):
+        """
+        Returns the prompt for contextual chunking with document content
+        """
+        return _PROMPT_PREFIX + self.document_content + _PROMPT_SUFFIX
\ No newline at end of file
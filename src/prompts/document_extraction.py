@@ -1,22 +1,8 @@
-class DocumentExtraction:
-    def __init__(self, document_content: str, file_path: str = "", target_market: str = "Consumer"):
-        """
-        Initialize with document content and metadata
-        
-        Args:
-            document_content: The extracted text content from the document
-            file_path: Path to the document (for URL reference)
-            target_market: Target market (Consumer or Enterprise)
-        """
-        self.document_content = document_content
-        self.file_path = file_path
-        self.target_market = target_market
-    
-    def get_extraction_prompt(self):
-        """
-        Returns the prompt for document content extraction
-        """
-        prompt_template = """Extract the content from this document in markdown.
+import string
+
+
+# Document extraction prompt; {document_content}, {file_path} and {target_market} are filled in per call
+_PROMPT_TEMPLATE = """Extract the content from this document in markdown.
 
 === IMPORTANT ===
 1. Maintain the exact words used in the main content.
@@ -55,9 +41,45 @@ DOCUMENT CONTENT:
 FILE PATH: {file_path}
 TARGET MARKET: {target_market}
 """
+
+
+def _compile_template(template: str) -> tuple:
+    """Split a str.format template into (text, is_literal) parts; fields are stored by name."""
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        if literal:
+            parts.append((literal, True))
+        if field is not None:
+            parts.append((field, False))
+    return tuple(parts)
+
+
+# Parse the format string once at import, so each prompt is a single join of
+# literal text and field values instead of a str.format call
+_PROMPT_PARTS = _compile_template(_PROMPT_TEMPLATE)
+
+
+class DocumentExtraction:
+    def __init__(self, document_content: str, file_path: str = "", target_market: str = "Consumer"):
+        """
+        Initialize with document content and metadata
         
-        return prompt_template.format(
-            document_content=self.document_content,
-            file_path=self.file_path,
-            target_market=self.target_market
-        )
\ No newline at end of file
+        Args:
+            document_content: The extracted text content from the document
+            file_path: Path to the document (for URL reference)
+            target_market: Target market (Consumer or Enterprise)
+        """
+        self.document_content = document_content
+        self.file_path = file_path
+        self.target_market = target_market
+    
+    def get_extraction_prompt(self):
+        """
+        Returns the prompt for document content extraction
+        """
+        values = {
+            'document_content': self.document_content,
+            'file_path': self.file_path,
+            'target_market': self.target_market,
+        }
+        return "".join([part if is_literal else str(values[part]) for part, is_literal in _PROMPT_PARTS])
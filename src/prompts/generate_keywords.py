@@ -1,18 +1,5 @@
-class KeywordGenerator:
-    def __init__(self, chunk_content: str):
-        """
-        Initialize with chunk content for keyword generation
-        
-        Args:
-            chunk_content: The content to extract keywords from
-        """
-        self.chunk_content = chunk_content
-    
-    def get_keyword_prompt(self):
-        """
-        Returns the prompt for keyword generation
-        """
-        prompt_template = """
+# Keyword generation prompt; the chunk is inserted at {chunk_content}
+_PROMPT_TEMPLATE = """
 **Keyword Generation:** From the extracted chunk below, extract 2 to max 10 concise and specific keywords for search indexing or content categorization.
 
 1. The keywords must reflect core offerings, product names, or specific service features mentioned in the content.
@@ -35,5 +22,23 @@ CHUNK CONTENT:
 {chunk_content}
 
         """
+
+# Split once at import so each prompt is built by concatenation rather than str.replace
+_PROMPT_PREFIX, _PROMPT_SUFFIX = _PROMPT_TEMPLATE.split("{chunk_content}", 1)
+
+
+class KeywordGenerator:
+    def __init__(self, chunk_content: str):
+        """
+        Initialize with chunk content for keyword generation
         
-        return prompt_template.replace("{chunk_content}", self.chunk_content)
\ No newline at end of file
+        Args:
+            chunk_content: The content to extract keywords from
+        """
+        self.chunk_content = chunk_content
+    
+    def get_keyword_prompt(self):
+        """
+        Returns the prompt for keyword generation
+        """
+        return _PROMPT_PREFIX + self.chunk_content + _PROMPT_SUFFIX
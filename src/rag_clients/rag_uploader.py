@@ -2,12 +2,46 @@
 Generic RAG uploader interface for managing different RAG clients.
 """
 
+import asyncio
 import os
 import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=256)
+def _load_json(json_path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a JSON file, using orjson when it is installed.
+    
+    The mtime and size arguments are only part of the cache key, so a file
+    that changes on disk is parsed again instead of served from the cache.
+    """
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_json(json_path: str) -> Any:
+    """Read a JSON file, reusing the parsed result for unchanged files (e.g. upload retries)."""
+    json_path = os.path.normpath(json_path)
+    st = os.stat(json_path)
+    return _load_json(json_path, st.st_mtime_ns, st.st_size)
+
 
 class RAGClient(ABC):
     """Abstract base class for RAG clients."""
@@ -54,20 +88,27 @@ class RAGFlowClient(RAGClient):
         self.dataset_id = None
         self.document_id = None
         
-        # Import the actual RAGFlow client
-        from src.rag_clients.ragflow.add_chunk import RAGFlowClient as RFClient
-        
         # Get credentials from environment
-        api_key = os.getenv("RAGFLOW_API_KEY")
-        base_url = os.getenv("RAGFLOW_URL")
+        self._api_key = os.getenv("RAGFLOW_API_KEY")
+        self._base_url = os.getenv("RAGFLOW_URL")
         
-        if not api_key or not base_url:
+        if not self._api_key or not self._base_url:
             raise ValueError("RAGFLOW_API_KEY and RAGFLOW_URL must be set in environment")
         
-        self.client = RFClient(api_key, base_url)
-        
-        # Set reference to parent uploader for caching
-        self.client._parent_uploader = self
+        # The actual RAGFlow client (and its requests/urllib3 imports) is created on first use
+        self._client = None
+        # RAGUploader that owns the dataset/document ID caches (set after construction)
+        self._parent_uploader = None
+    
+    @property
+    def client(self):
+        """Underlying RAGFlow API client, imported and created on first access."""
+        if self._client is None:
+            from src.rag_clients.ragflow.add_chunk import RAGFlowClient as RFClient
+            self._client = RFClient(self._api_key, self._base_url)
+            # Set reference to parent uploader for caching
+            self._client._parent_uploader = self
+        return self._client
     
     def validate_config(self) -> bool:
         """Validate RAGFlow configuration."""
@@ -84,12 +125,24 @@ class RAGFlowClient(RAGClient):
         try:
             # Use the new upload method from add_chunk.py
             from src.rag_clients.ragflow.add_chunk import upload_chunks_from_data
-            return upload_chunks_from_data(chunks_data, timestamp, domain, original_filename)
+            uploader = self._parent_uploader
+            if uploader is None:
+                return upload_chunks_from_data(chunks_data, timestamp, domain, original_filename)
+            
+            uploaded = upload_chunks_from_data(
+                chunks_data, timestamp, domain, original_filename,
+                dataset_cache=uploader._dataset_cache,
+                document_cache=uploader._document_cache
+            )
+            # Persist right away only when a dataset ID changed; new document IDs are
+            # written with the rest at the end of the batch
+            uploader._save_id_cache(datasets_changed_only=True)
+            return uploaded
             
         except Exception as e:
             print(f"    ❌ Failed to upload chunks: {e}")
-            import traceback
-            traceback.print_exc()
+            # Full traceback only when debug logging is enabled for this module
+            logger.debug("Chunk upload failed", exc_info=True)
             return 0
 
 
@@ -131,17 +184,83 @@ class RAGUploader:
         self.enabled = config.get('enabled', False)
         self.client_name = config.get('client', 'ragflow')
         self.streaming = config.get('streaming', True)
+        self.upload_concurrency = max(1, int(config.get('upload_concurrency', 8)))
         self.client = None
         
-        # Cache for dataset/document IDs per domain to avoid recreating
+        # Cache for dataset/document IDs per domain to avoid recreating,
+        # persisted so later runs skip the RAGFlow lookups too
+        self._cache_path = Path(config.get('cache_path', '.rag_cache.json'))
         self._dataset_cache = {}
         self._document_cache = {}
+        self._saved_ids = None
         # Track uploaded files to prevent duplicates in streaming mode
         self._uploaded_files = set()
+        # Guards the caches above when uploads run on worker threads
+        self._lock = threading.Lock()
         
         if self.enabled:
+            self._load_id_cache()
             self._initialize_client()
     
+    def _load_id_cache(self):
+        """Load dataset/document IDs saved by a previous run, if any."""
+        try:
+            cached = _read_json(str(self._cache_path))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable RAG ID cache {self._cache_path}: {e}")
+            return
+        
+        if not isinstance(cached, dict):
+            return
+        
+        # Dataset names are "<crawl timestamp>_<domain>", so entries of older crawls are
+        # never looked up again; keep only the newest timestamp and its documents
+        datasets = cached.get('datasets') or {}
+        latest = max((name[:15] for name in datasets), default=None)
+        datasets = {name: dataset_id for name, dataset_id in datasets.items() if name[:15] == latest}
+        dataset_ids = set(datasets.values())
+        documents = {
+            key: document_id for key, document_id in (cached.get('documents') or {}).items()
+            if key.split('/', 1)[0] in dataset_ids
+        }
+        
+        self._dataset_cache.update(datasets)
+        self._document_cache.update(documents)
+        self._saved_ids = (dict(self._dataset_cache), dict(self._document_cache))
+    
+    def _save_id_cache(self, datasets_changed_only: bool = False):
+        """
+        Atomically write the dataset/document ID caches when they changed.
+        
+        Args:
+            datasets_changed_only: Skip the write unless a dataset ID changed; new document
+                IDs alone wait for the next full save
+        """
+        with self._lock:
+            snapshot = (dict(self._dataset_cache), dict(self._document_cache))
+            if snapshot == self._saved_ids:
+                return
+            saved_datasets = self._saved_ids[0] if self._saved_ids else {}
+            if datasets_changed_only and snapshot[0] == saved_datasets:
+                return
+            
+            payload = json.dumps({'datasets': snapshot[0], 'documents': snapshot[1]})
+            tmp_path = f"{self._cache_path}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self._cache_path)
+                self._saved_ids = snapshot
+            except OSError as e:
+                print(f"⚠️ Could not save RAG ID cache {self._cache_path}: {e}")
+    
+    def save_id_cache(self):
+        """Write any dataset/document IDs not saved yet, e.g. once streaming uploads are done."""
+        if self.enabled:
+            self._save_id_cache()
+    
     def _initialize_client(self):
         """Initialize the selected RAG client."""
         if self.client_name not in self.CLIENTS:
@@ -152,6 +271,7 @@ class RAGUploader:
         
         try:
             self.client = client_class(client_config)
+            self.client._parent_uploader = self
             if not self.client.validate_config():
                 print(f"⚠️ RAG client '{self.client_name}' configuration is invalid")
                 self.enabled = False
@@ -178,8 +298,7 @@ class RAGUploader:
             return 0
         
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(json_path)
             
             return self.client.upload_chunks(data, timestamp, domain, json_path)
         except Exception as e:
@@ -201,8 +320,9 @@ class RAGUploader:
         
         # Check if file was already uploaded (prevent duplicates)
         json_path_normalized = os.path.normpath(json_path)
-        if json_path_normalized in self._uploaded_files:
-            return 0
+        with self._lock:
+            if json_path_normalized in self._uploaded_files:
+                return 0
         
         try:
             # Extract timestamp and domain from path
@@ -212,15 +332,15 @@ class RAGUploader:
                 timestamp = path_parts[-3]  # timestamp directory
                 domain = path_parts[-2]     # domain directory
                 
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _read_json(json_path)
                 
                 # Pass the json_path as original_filename
                 chunks_uploaded = self.client.upload_chunks(data, timestamp, domain, json_path)
                 
                 # Mark file as uploaded if successful
                 if chunks_uploaded > 0:
-                    self._uploaded_files.add(json_path_normalized)
+                    with self._lock:
+                        self._uploaded_files.add(json_path_normalized)
                 
                 return chunks_uploaded
             else:
@@ -230,6 +350,20 @@ class RAGUploader:
             print(f"❌ Error streaming from {json_path}: {e}")
             return 0
     
+    async def upload_single_file_streaming_async(self, json_path: str) -> int:
+        """
+        Async variant of upload_single_file_streaming for callers on an event loop.
+        
+        The blocking HTTP upload runs in a worker thread so the loop keeps serving other work.
+        
+        Args:
+            json_path: Path to semantic JSON file
+            
+        Returns:
+            Number of chunks uploaded
+        """
+        return await asyncio.to_thread(self.upload_single_file_streaming, json_path)
+    
     def upload_from_directory(self, semantic_dir: str) -> int:
         """
         Upload all chunks from a semantic directory.
@@ -247,12 +381,14 @@ class RAGUploader:
         json_files = []
         
         # Find all JSON files in the directory
-        for domain in os.listdir(semantic_dir):
-            domain_dir = os.path.join(semantic_dir, domain)
-            if os.path.isdir(domain_dir):
-                for file in os.listdir(domain_dir):
-                    if file.endswith('.json'):
-                        json_files.append(os.path.join(domain_dir, file))
+        with os.scandir(semantic_dir) as domain_entries:
+            for domain_entry in domain_entries:
+                if not domain_entry.is_dir():
+                    continue
+                with os.scandir(domain_entry.path) as file_entries:
+                    for file_entry in file_entries:
+                        if file_entry.name.endswith('.json'):
+                            json_files.append((file_entry.path, domain_entry.name, file_entry.name))
         
         if not json_files:
             return 0
@@ -263,23 +399,35 @@ class RAGUploader:
         # Extract timestamp from directory path
         timestamp = os.path.basename(semantic_dir)
         
-        for json_file in json_files:
-            file_name = os.path.basename(json_file)
-            # Extract domain from file path
-            domain = os.path.basename(os.path.dirname(json_file))
-            
-            print(f"  📄 Uploading {file_name} ({domain})...", end=" ")
-            
-            chunks_uploaded = self.upload_from_file(json_file, timestamp, domain)
-            if chunks_uploaded > 0:
-                print(f"✅ {chunks_uploaded} chunks")
-                total_uploaded += chunks_uploaded
+        # The first file of each domain creates that domain's dataset, so those
+        # run before the rest to avoid racing on find_or_create_dataset
+        first_batch = []
+        rest_batch = []
+        seen_domains = set()
+        for entry in json_files:
+            domain = entry[1]
+            if domain in seen_domains:
+                rest_batch.append(entry)
             else:
-                print(f"⚠️ skipped")
+                seen_domains.add(domain)
+                first_batch.append(entry)
+        
+        def upload(entry):
+            return self.upload_from_file(entry[0], timestamp, entry[1])
+        
+        with ThreadPoolExecutor(max_workers=self.upload_concurrency) as executor:
+            for batch in (first_batch, rest_batch):
+                for (_, domain, file_name), chunks_uploaded in zip(batch, executor.map(upload, batch)):
+                    if chunks_uploaded > 0:
+                        print(f"  📄 Uploading {file_name} ({domain})... ✅ {chunks_uploaded} chunks")
+                        total_uploaded += chunks_uploaded
+                    else:
+                        print(f"  📄 Uploading {file_name} ({domain})... ⚠️ skipped")
         
         if total_uploaded > 0:
             print(f"✅ Total uploaded to {self.client_name}: {total_uploaded} chunks")
         
+        self._save_id_cache()
         return total_uploaded
     
     def is_enabled(self) -> bool:
@@ -3,14 +3,30 @@
 Upload semantic chunks from crawled_semantic directory to RAGFlow dataset.
 """
 
+import argparse
+import hashlib
 import json
 import os
+import random
+import sqlite3
+import time
+import traceback
 import requests
+from requests.adapters import HTTPAdapter
 import urllib3
 import logging
+import queue
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 from dotenv import load_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 try:
     from ...console import console, print_error, print_success, print_warning, print_info, print_processing
 except ImportError:
@@ -31,27 +47,214 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Configuration variables from environment
 RAGFLOW_API_KEY = os.getenv("RAGFLOW_API_KEY")
 RAGFLOW_BASE_URL = os.getenv("RAGFLOW_URL")
+# Maximum add-chunk requests in flight per document (1 = strictly sequential)
+RAGFLOW_CONCURRENCY = max(1, int(os.getenv("RAGFLOW_CONCURRENCY", "4")))
+# Chunks shorter than this (after stripping whitespace) are too small to be useful for
+# retrieval, e.g. stray menu labels, and are not uploaded (0 = only skip empty chunks)
+MIN_CHUNK_CHARS = max(0, int(os.getenv("RAGFLOW_MIN_CHUNK_CHARS", "32")))
+# Optional SQLite ledger of chunks already added, so re-runs skip them. Off unless set to a
+# file path; chunks deleted by hand in RAGFlow stay skipped until their ledger rows are removed
+RAGFLOW_CHUNK_LEDGER = os.path.expanduser(os.getenv("RAGFLOW_CHUNK_LEDGER", ""))
+
+
+def _require_env():
+    """Validate the environment variables used when no credentials are passed explicitly."""
+    if not RAGFLOW_API_KEY:
+        raise ValueError("RAGFLOW_API_KEY environment variable is missing. Please set it in your .env file or environment.")
+    if not RAGFLOW_BASE_URL:
+        raise ValueError("RAGFLOW_URL environment variable is missing. Please set it in your .env file or environment.")
+
+
+def _load_json_file(json_path: str) -> Any:
+    """Read and parse a JSON file, using orjson when it is installed."""
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _is_timestamp_name(name: str) -> bool:
+    """Whether name has the fixed-width YYYYMMDD_HHMMSS shape of a crawl timestamp."""
+    return len(name) == 15 and name[8] == '_' and name[:8].isdigit() and name[9:].isdigit()
+
+
+def _parse_timestamp(name: str) -> Optional[datetime]:
+    """Parse a YYYYMMDD_HHMMSS crawl timestamp by slicing, without strptime."""
+    if not isinstance(name, str) or not _is_timestamp_name(name):
+        return None
+    try:
+        return datetime(int(name[0:4]), int(name[4:6]), int(name[6:8]),
+                        int(name[9:11]), int(name[11:13]), int(name[13:15]))
+    except ValueError:
+        return None
+
+
+class _ChunkLedger:
+    """SQLite record of (dataset_id, document_id, content digest) triples already added to RAGFlow."""
+    
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Shared by the upload threads; every access holds self._lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS uploaded_chunks ("
+            "dataset_id TEXT NOT NULL, document_id TEXT NOT NULL, chunk_hash BLOB NOT NULL, "
+            "chunk_id TEXT, PRIMARY KEY (dataset_id, document_id, chunk_hash))"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+    
+    def contains(self, dataset_id: str, document_id: str, digest: bytes) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM uploaded_chunks WHERE dataset_id = ? AND document_id = ? AND chunk_hash = ?",
+                (dataset_id, document_id, digest)
+            ).fetchone()
+        return row is not None
+    
+    def add(self, dataset_id: str, document_id: str, digest: bytes, chunk_id: Optional[str]):
+        """Record a chunk; written to disk on the next commit()."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploaded_chunks (dataset_id, document_id, chunk_hash, chunk_id) "
+                "VALUES (?, ?, ?, ?)",
+                (dataset_id, document_id, digest, chunk_id)
+            )
+    
+    def forget_dataset(self, dataset_id: str):
+        """Drop every chunk recorded for a dataset, e.g. after it was deleted."""
+        with self._lock:
+            self._conn.execute("DELETE FROM uploaded_chunks WHERE dataset_id = ?", (dataset_id,))
+            self._conn.commit()
+    
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
 
-# Validate environment variables
-if not RAGFLOW_API_KEY:
-    raise ValueError("RAGFLOW_API_KEY environment variable is missing. Please set it in your .env file or environment.")
-if not RAGFLOW_BASE_URL:
-    raise ValueError("RAGFLOW_URL environment variable is missing. Please set it in your .env file or environment.")
+def _open_chunk_ledger() -> Optional[_ChunkLedger]:
+    """Open the chunk ledger at RAGFLOW_CHUNK_LEDGER, or None when disabled or unavailable."""
+    if not RAGFLOW_CHUNK_LEDGER:
+        return None
+    try:
+        return _ChunkLedger(RAGFLOW_CHUNK_LEDGER)
+    except (OSError, sqlite3.Error) as e:
+        print_warning(f"Chunk ledger unavailable, re-runs will upload all chunks: {e}")
+        return None
+
+
+# Retry backoff (decorrelated jitter) and circuit breaker settings, in seconds
+_BACKOFF_BASE = 1.0
+_BACKOFF_CAP = 8.0
+_CIRCUIT_FAILURE_THRESHOLD = 3
+_CIRCUIT_COOLDOWN = 30.0
 
 
 class RAGFlowClient:
-    def __init__(self, api_key: str, base_url: str):
+    # Per-host breaker state shared by all clients: base_url -> {'open_until', 'failures'}
+    _circuits: Dict[str, dict] = {}
+    _circuit_lock = threading.Lock()
+    
+    def __init__(self, api_key: str, base_url: str = "https://rag-chat.innov.mt",
+                 chunk_ledger: Optional[_ChunkLedger] = None):
+        """
+        Args:
+            api_key: RAGFlow API key
+            base_url: RAGFlow API base URL
+            chunk_ledger: Optional persistent record of added chunks, so re-runs skip them
+        """
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        
+        # One pooled session per client: requests reuse kept-alive connections
+        # (also across the chunk upload threads) instead of a new TCP/TLS handshake each
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(self.headers)
+        self.session.verify = False
+        
+        # Dataset name -> ID and (dataset_id, document name) -> document lookups,
+        # kept for the life of the client so repeated uploads skip the list calls
+        self._dataset_ids: Dict[str, str] = {}
+        self._documents: Dict[tuple, dict] = {}
+        # Guards quick dict and ledger updates only; never held across a request
+        self._cache_lock = threading.Lock()
+        # One lock per dataset name, held while that dataset is looked up or created
+        self._dataset_locks: Dict[str, threading.Lock] = {}
+        # (dataset_id, document_id, content digest) of chunks added by this client, to skip re-uploads;
+        # the ledger, when given, extends that across runs
+        self._uploaded_chunks: set = set()
+        self._ledger = chunk_ledger
+    
+    def invalidate(self, dataset_name: str):
+        """Forget the cached ID of a dataset and the documents looked up in it."""
+        with self._cache_lock:
+            dataset_id = self._dataset_ids.pop(dataset_name, None)
+            if dataset_id:
+                for key in [key for key in self._documents if key[0] == dataset_id]:
+                    del self._documents[key]
+    
+    def has_cached_dataset(self, dataset_name: str) -> bool:
+        """Whether find_or_create_dataset would answer from the cache."""
+        return dataset_name in self._dataset_ids
+    
+    def has_uploaded_chunk(self, dataset_id: str, document_id: str, digest: bytes) -> bool:
+        """Whether a chunk with this content digest was already added to the document."""
+        if (dataset_id, document_id, digest) in self._uploaded_chunks:
+            return True
+        return self._ledger is not None and self._ledger.contains(dataset_id, document_id, digest)
+    
+    def remember_uploaded_chunk(self, dataset_id: str, document_id: str, digest: bytes, chunk_id: str = None):
+        """Record a successfully added chunk (persisted by commit_uploaded_chunks)."""
+        with self._cache_lock:
+            self._uploaded_chunks.add((dataset_id, document_id, digest))
+        if self._ledger is not None:
+            self._ledger.add(dataset_id, document_id, digest, chunk_id)
+    
+    def commit_uploaded_chunks(self):
+        """Write chunks recorded since the last commit to the ledger in one transaction."""
+        if self._ledger is not None:
+            self._ledger.commit()
+    
+    def _circuit_state(self) -> dict:
+        """Return the breaker state for this client's host."""
+        with self._circuit_lock:
+            return self._circuits.setdefault(self.base_url, {'open_until': 0.0, 'failures': 0})
+    
+    def _reset_connection_failures(self):
+        """Note that the host answered, closing the count of consecutive failures."""
+        circuit = self._circuit_state()
+        with self._circuit_lock:
+            circuit['failures'] = 0
+    
+    def _check_circuit(self):
+        """Fail fast while the host's circuit is open."""
+        if time.monotonic() < self._circuit_state()['open_until']:
+            # Don't print here - let the calling code handle it to avoid duplicates
+            raise Exception("RAGFlow server unavailable (circuit open) - upload failed")
+    
+    def _record_connection_failure(self):
+        """Count a connection failure; open the circuit after too many in a row."""
+        circuit = self._circuit_state()
+        with self._circuit_lock:
+            circuit['failures'] += 1
+            if circuit['failures'] >= _CIRCUIT_FAILURE_THRESHOLD:
+                circuit['open_until'] = time.monotonic() + _CIRCUIT_COOLDOWN
     
     def _make_request_with_retry(self, method: str, url: str, max_retries: int = 3, **kwargs):
         """
         Make HTTP request with exponential backoff retry for timeouts and server errors.
         
+        Retries sleep with capped decorrelated jitter. After repeated connection failures
+        the host's circuit opens and requests fail fast until the cooldown has passed.
+        
         Args:
             method: HTTP method ('GET', 'POST', 'PUT', 'DELETE')
             url: Request URL
@@ -61,33 +264,39 @@ class RAGFlowClient:
         Returns:
             Response object
         """
-        import time
-        import random
+        # Encode JSON bodies once up front (with orjson when installed); the session
+        # already sends the application/json Content-Type
+        if orjson is not None and kwargs.get('json') is not None:
+            kwargs['data'] = orjson.dumps(kwargs.pop('json'))
         
+        delay = _BACKOFF_BASE
         for attempt in range(max_retries + 1):
             try:
-                # Add delay with exponential backoff for retries
+                # Add delay with decorrelated jitter backoff for retries
                 if attempt > 0:
-                    delay = (2 ** attempt) + random.uniform(1.0, 3.0)  # 3-5s, 5-7s, 9-11s
+                    delay = min(_BACKOFF_CAP, random.uniform(_BACKOFF_BASE, delay * 3))
                     print(f"    ⏳ RAG API retry {attempt}/{max_retries}, waiting {delay:.1f}s...")
                     time.sleep(delay)
                 
+                # Checked on every attempt, so callers already retrying stop once another
+                # thread's failures have opened the circuit
+                self._check_circuit()
+                
                 # Make the request
-                if method.upper() == 'GET':
-                    response = requests.get(url, **kwargs)
-                elif method.upper() == 'POST':
-                    response = requests.post(url, **kwargs)
-                elif method.upper() == 'PUT':
-                    response = requests.put(url, **kwargs)
-                elif method.upper() == 'DELETE':
-                    response = requests.delete(url, **kwargs)
-                else:
+                if method.upper() not in ('GET', 'POST', 'PUT', 'DELETE'):
                     raise ValueError(f"Unsupported HTTP method: {method}")
+                # Passed per request too: with REQUESTS_CA_BUNDLE set, requests would
+                # otherwise let the environment override session.verify
+                kwargs.setdefault('verify', False)
+                response = self.session.request(method.upper(), url, **kwargs)
                 
+                # Any answer from the server means it is reachable again
+                self._reset_connection_failures()
                 response.raise_for_status()
                 return response
                 
             except requests.exceptions.Timeout as e:
+                self._record_connection_failure()
                 if attempt < max_retries:
                     print(f"    ⚠️ RAG API timeout, retrying (attempt {attempt + 1}/{max_retries + 1})...")
                     continue
@@ -96,6 +305,7 @@ class RAGFlowClient:
                     raise
                     
             except requests.exceptions.ConnectionError as e:
+                self._record_connection_failure()
                 if "getaddrinfo failed" in str(e) or "NameResolutionError" in str(e):
                     # Don't print here - let the calling code handle it to avoid duplicates
                     raise Exception("RAGFlow server unreachable - upload failed") from None
@@ -127,10 +337,23 @@ class RAGFlowClient:
         if keywords:
             params['keywords'] = keywords
         
-        response = self._make_request_with_retry('GET', url, headers=self.headers, params=params, verify=False)
+        response = self._make_request_with_retry('GET', url, params=params)
         return response.json()
     
     def find_document_by_name(self, dataset_id: str, document_name: str) -> Optional[dict]:
+        """Find a document by name in the dataset (found documents are cached)."""
+        key = (dataset_id, document_name)
+        cached = self._documents.get(key)
+        if cached is not None:
+            return cached
+        
+        doc = self._find_document_by_name(dataset_id, document_name)
+        if doc is not None:
+            with self._cache_lock:
+                self._documents[key] = doc
+        return doc
+    
+    def _find_document_by_name(self, dataset_id: str, document_name: str) -> Optional[dict]:
         """Find a document by name in the dataset."""
         try:
             docs_response = self.list_documents(dataset_id, keywords=document_name)
@@ -164,9 +387,40 @@ class RAGFlowClient:
     def list_datasets(self) -> dict:
         """List all datasets."""
         url = f"{self.base_url}/api/v1/datasets"
-        response = self._make_request_with_retry('GET', url, headers=self.headers, verify=False)
+        response = self._make_request_with_retry('GET', url)
         return response.json()
     
+    def get_datasets(self) -> dict:
+        """Get all existing datasets (alias of list_datasets)."""
+        return self.list_datasets()
+    
+    def find_dataset_by_name(self, name: str) -> Optional[dict]:
+        """Find dataset by name."""
+        datasets = self.list_datasets()
+        for dataset in datasets.get('data', []) if isinstance(datasets, dict) else []:
+            if isinstance(dataset, dict) and dataset.get('name') == name:
+                return dataset
+        return None
+    
+    def delete_dataset(self, dataset_id: str) -> bool:
+        """Delete a dataset by ID."""
+        url = f"{self.base_url}/api/v1/datasets"
+        try:
+            response = self._make_request_with_retry('DELETE', url, json={"ids": [dataset_id]})
+        except Exception:
+            return False
+        
+        # Forget the deleted dataset so later lookups don't hand out its stale ID, and its
+        # chunks so a recreated dataset of the same name gets them uploaded again
+        with self._cache_lock:
+            names = [name for name, cached_id in self._dataset_ids.items() if cached_id == dataset_id]
+            self._uploaded_chunks = {key for key in self._uploaded_chunks if key[0] != dataset_id}
+        for name in names:
+            self.invalidate(name)
+        if self._ledger is not None:
+            self._ledger.forget_dataset(dataset_id)
+        return response.status_code == 200
+    
     def create_dataset(self, name: str, description: str = None) -> dict:
         """Create a new dataset."""
         url = f"{self.base_url}/api/v1/datasets"
@@ -177,10 +431,31 @@ class RAGFlowClient:
         if description:
             data["description"] = description
         
-        response = self._make_request_with_retry('POST', url, headers=self.headers, json=data, verify=False)
+        response = self._make_request_with_retry('POST', url, json=data)
         return response.json()
     
     def find_or_create_dataset(self, name: str, description: str = None) -> str:
+        """Find existing dataset or create new one (cached per name)."""
+        cached = self._dataset_ids.get(name)
+        if cached:
+            return cached
+        
+        # Serialized per name so concurrent uploads cannot both miss and create the same
+        # dataset, without making chunk uploads wait behind the lookup
+        with self._cache_lock:
+            dataset_lock = self._dataset_locks.setdefault(name, threading.Lock())
+        with dataset_lock:
+            cached = self._dataset_ids.get(name)
+            if cached:
+                return cached
+            
+            dataset_id = self._find_or_create_dataset(name, description)
+            if dataset_id:
+                with self._cache_lock:
+                    self._dataset_ids[name] = dataset_id
+            return dataset_id
+    
+    def _find_or_create_dataset(self, name: str, description: str = None) -> str:
         """Find existing dataset or create new one."""
         try:
             # Try to find existing dataset
@@ -223,7 +498,7 @@ class RAGFlowClient:
         url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents"
         data = {"name": name}
         
-        response = self._make_request_with_retry('POST', url, headers=self.headers, json=data, verify=False)
+        response = self._make_request_with_retry('POST', url, json=data)
         return response.json()
     
     def find_or_create_document(self, dataset_id: str, name: str) -> str:
@@ -250,15 +525,21 @@ class RAGFlowClient:
     
     def upload_file(self, dataset_id: str, file_path: str) -> dict:
         """Upload a file to a dataset (following working demo pattern)."""
+        with open(file_path, 'rb') as file:
+            content = file.read()
+        return self.upload_content(dataset_id, os.path.basename(file_path), content)
+    
+    def upload_content(self, dataset_id: str, filename: str, content: bytes) -> dict:
+        """Upload in-memory content to a dataset as a document named filename."""
         url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents"
         
-        # Use file upload headers (remove Content-Type to let requests set it)
-        upload_headers = {"Authorization": f"Bearer {self.api_key}"}
+        # Drop the session's JSON Content-Type so requests sets the multipart one
+        upload_headers = {"Content-Type": None}
         
-        with open(file_path, 'rb') as file:
-            files = {'file': (os.path.basename(file_path), file, 'application/octet-stream')}
-            response = self._make_request_with_retry('POST', url, headers=upload_headers, files=files, verify=False)
-            return response.json()
+        # Bytes rather than a file object, so a retried request sends the full body again
+        files = {'file': (filename, content, 'application/octet-stream')}
+        response = self._make_request_with_retry('POST', url, headers=upload_headers, files=files)
+        return response.json()
     
     def set_document_metadata(self, dataset_id: str, document_id: str, source: str, timestamp: str) -> bool:
         """Set metadata for a document using RAGFlow API."""
@@ -266,12 +547,8 @@ class RAGFlowClient:
             url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents/{document_id}"
             
             # Parse timestamp to readable date (format: 2025-08-14 12:24)
-            try:
-                from datetime import datetime
-                dt = datetime.strptime(timestamp, '%Y%m%d_%H%M%S')
-                date = dt.strftime('%Y-%m-%d %H:%M')
-            except:
-                date = timestamp
+            dt = _parse_timestamp(timestamp)
+            date = f"{dt:%Y-%m-%d %H:%M}" if dt else timestamp
             
             # Prepare request body according to API spec - only date and source
             request_body = {
@@ -282,7 +559,7 @@ class RAGFlowClient:
             }
             
             # Set metadata using PUT request
-            response = self._make_request_with_retry('PUT', url, headers=self.headers, json=request_body, verify=False)
+            response = self._make_request_with_retry('PUT', url, json=request_body)
             
             result = response.json()
             # Metadata set silently
@@ -303,7 +580,7 @@ class RAGFlowClient:
         if questions:
             data["questions"] = questions
         
-        response = self._make_request_with_retry('POST', url, headers=self.headers, json=data, verify=False)
+        response = self._make_request_with_retry('POST', url, json=data)
         return response.json()
 
 
@@ -313,38 +590,38 @@ def get_latest_timestamp_dir(base_dir: str = "crawled_semantic") -> Optional[str
         print(f"❌ Directory not found: {base_dir}")
         return None
     
-    # Get all timestamp directories
-    timestamp_dirs = []
-    for item in os.listdir(base_dir):
-        item_path = os.path.join(base_dir, item)
-        if os.path.isdir(item_path):
-            try:
-                # Check if it matches timestamp format YYYYMMDD_HHMMSS
-                from datetime import datetime
-                datetime.strptime(item, '%Y%m%d_%H%M%S')
-                timestamp_dirs.append(item)
-            except ValueError:
-                continue
+    # Get all timestamp directories. Names are fixed-width YYYYMMDD_HHMMSS, so the
+    # lexicographic max is the latest run; impossible dates such as 20251399_999999
+    # are rejected, as strptime did
+    with os.scandir(base_dir) as entries:
+        timestamp_dirs = [
+            entry.name for entry in entries
+            if _parse_timestamp(entry.name) is not None and entry.is_dir()
+        ]
     
     if not timestamp_dirs:
         print(f"❌ No timestamp directories found in {base_dir}")
         return None
     
-    # Sort and get the latest
-    timestamp_dirs.sort()
-    latest = timestamp_dirs[-1]
+    latest = max(timestamp_dirs)
     print_info(f"Using latest timestamp directory: {latest}")
     return os.path.join(base_dir, latest)
 
 
 def process_semantic_json(json_path: str, dataset_id: str, document_id: str, 
-                         ragflow_client: RAGFlowClient) -> int:
-    """Process a single semantic JSON file and upload its chunks to RAGFlow."""
+                         ragflow_client: RAGFlowClient, data: Any = None) -> int:
+    """Process a single semantic JSON file and upload its chunks to RAGFlow.
+    
+    data may hold the already-parsed file (or the exception parsing raised);
+    when None the file is read here.
+    """
     print(f"\n📄 Processing: {json_path}")
     
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if data is None:
+            data = _load_json_file(json_path)
+        elif isinstance(data, Exception):
+            raise data
         
         source = data.get('source', 'Unknown')
         chunks = data.get('chunks', [])
@@ -357,30 +634,30 @@ def process_semantic_json(json_path: str, dataset_id: str, document_id: str,
         print_info(f"Found {len(chunks)} chunks to upload")
         
         success_count = 0
+        pending = []
         
         for i, chunk in enumerate(chunks, 1):
-            content = chunk.get('content', '')
-            keywords = chunk.get('keywords', [])
-            
-            if not content:
+            if not chunk.get('content', ''):
                 print_warning(f"Chunk {i}: Empty content, skipping")
                 continue
+            pending.append((i, chunk))
+        
+        pending, too_short = _drop_short_chunks(pending)
+        pending, duplicates = _drop_duplicate_chunks(ragflow_client, dataset_id, document_id, pending)
+        for i in duplicates:
+            print_warning(f"Chunk {i}: Duplicate content, skipping")
+        
+        for i, result in _add_chunks_concurrently(ragflow_client, dataset_id, document_id, pending):
+            if isinstance(result, Exception):
+                print_error(f"Chunk {i}/{len(chunks)}: Failed - {result}")
+                continue
             
-            try:
-                result = ragflow_client.add_chunk(
-                    dataset_id=dataset_id,
-                    document_id=document_id,
-                    content=content,
-                    important_keywords=keywords
-                )
-                
-                chunk_id = result.get('data', {}).get('id', 'Unknown')
-                print_success(f"Chunk {i}/{len(chunks)}: Uploaded (ID: {chunk_id})")
-                success_count += 1
-                
-            except Exception as e:
-                print_error(f"Chunk {i}/{len(chunks)}: Failed - {e}")
+            chunk_id = result.get('data', {}).get('id', 'Unknown')
+            print_success(f"Chunk {i}/{len(chunks)}: Uploaded (ID: {chunk_id})")
+            success_count += 1
         
+        if too_short:
+            print_info(f"Skipped {len(too_short)} chunks shorter than {MIN_CHUNK_CHARS} characters")
         print_success(f"Completed: {success_count}/{len(chunks)} chunks uploaded successfully")
         return success_count
         
@@ -389,7 +666,23 @@ def process_semantic_json(json_path: str, dataset_id: str, document_id: str,
         return 0
 
 
-def upload_chunks_from_data(data: Dict[str, Any], timestamp: str, domain: str, original_filename: str = None) -> int:
+_shared_client: Optional[RAGFlowClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def _get_shared_client() -> RAGFlowClient:
+    """Return the module-wide RAGFlow client, creating it on first use."""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _require_env()
+                _shared_client = RAGFlowClient(RAGFLOW_API_KEY, RAGFLOW_BASE_URL, _open_chunk_ledger())
+    return _shared_client
+
+
+def upload_chunks_from_data(data: Dict[str, Any], timestamp: str, domain: str, original_filename: str = None,
+                            dataset_cache: Dict[str, str] = None, document_cache: Dict[str, str] = None) -> int:
     """Upload chunks from semantic data using the working ragflow-demo approach.
     
     Args:
@@ -397,15 +690,45 @@ def upload_chunks_from_data(data: Dict[str, Any], timestamp: str, domain: str, o
         timestamp: Timestamp for dataset naming
         domain: Domain for dataset naming
         original_filename: Original JSON filename to use for document name
+        dataset_cache: Optional dataset name -> ID map, read and updated in place
+        document_cache: Optional "dataset_id/document_name" -> ID map, read and updated in place
         
     Returns:
         Number of chunks uploaded
     """
-    # Create dataset name using timestamp_domain format
     dataset_name = f"{timestamp}_{domain}"
+    ragflow_client = _get_shared_client()
+    cached_dataset_id = dataset_cache.get(dataset_name) if dataset_cache is not None else None
+    used_cache = bool(cached_dataset_id) or ragflow_client.has_cached_dataset(dataset_name)
+    
+    uploaded = _upload_chunks_from_data(data, timestamp, domain, original_filename, dataset_cache, document_cache)
     
-    # Import os module
-    import os
+    if uploaded is None and used_cache:
+        # The dataset or document could not be resolved with a cached ID, or RAGFlow answered
+        # 404 - the ID may be stale (e.g. the dataset was deleted in RAGFlow), so forget it and
+        # resolve everything again once. Zero uploads because every chunk was skipped is normal
+        # on a re-run and keeps the cache
+        ragflow_client.invalidate(dataset_name)
+        if dataset_cache is not None:
+            dataset_cache.pop(dataset_name, None)
+        if document_cache is not None and cached_dataset_id:
+            prefix = f"{cached_dataset_id}/"
+            for key in [key for key in list(document_cache) if key.startswith(prefix)]:
+                document_cache.pop(key, None)
+        uploaded = _upload_chunks_from_data(data, timestamp, domain, original_filename, dataset_cache, document_cache)
+    
+    return uploaded or 0
+
+
+def _upload_chunks_from_data(data: Dict[str, Any], timestamp: str, domain: str, original_filename: Optional[str],
+                             dataset_cache: Optional[Dict[str, str]], document_cache: Optional[Dict[str, str]]) -> Optional[int]:
+    """Upload chunks, reusing and recording dataset/document IDs in the given caches.
+    
+    Returns the number of chunks uploaded, or None when the dataset or document could not
+    be resolved or RAGFlow reported it missing (404).
+    """
+    # Create dataset name using timestamp_domain format
+    dataset_name = f"{timestamp}_{domain}"
     
     # Create document name from original filename (keep original extension)
     if original_filename:
@@ -414,77 +737,88 @@ def upload_chunks_from_data(data: Dict[str, Any], timestamp: str, domain: str, o
         document_name = f"{domain}.json"
     
     try:
-        # Initialize client
-        ragflow_client = RAGFlowClient(RAGFLOW_API_KEY, RAGFLOW_BASE_URL)
-        
-        # Find or create dataset
-        dataset_id = ragflow_client.find_or_create_dataset(
-            name=dataset_name,
-            description=f"Semantic chunks from {domain} crawled at {timestamp}"
-        )
+        # Shared client, so its connection pool and lookup caches survive between files
+        ragflow_client = _get_shared_client()
         
+        # Find or create dataset, unless an earlier upload already resolved it
+        dataset_id = dataset_cache.get(dataset_name) if dataset_cache is not None else None
         if not dataset_id:
-            return 0
+            dataset_id = ragflow_client.find_or_create_dataset(
+                name=dataset_name,
+                description=f"Semantic chunks from {domain} crawled at {timestamp}"
+            )
+            
+            if not dataset_id:
+                return None
+            
+            if dataset_cache is not None:
+                dataset_cache[dataset_name] = dataset_id
+        
+        document_key = f"{dataset_id}/{document_name}"
+        document_id = document_cache.get(document_key) if document_cache is not None else None
+        if document_id:
+            return _process_semantic_json_data(data, dataset_id, document_id, ragflow_client)
         
         # Check if document already exists
         existing_doc = ragflow_client.find_document_by_name(dataset_id, document_name)
         if existing_doc and isinstance(existing_doc, dict):
             document_id = existing_doc.get('id')
             if document_id:
+                if document_cache is not None:
+                    document_cache[document_key] = document_id
                 # Use existing document
-                return process_semantic_json_data(data, dataset_id, document_id, ragflow_client)
-        
-        # Create an empty document first (RAGFlow requirement) 
-        import tempfile
-        import os
-        
-        temp_dir = tempfile.gettempdir()
-        temp_file_path = os.path.join(temp_dir, document_name)
+                return _process_semantic_json_data(data, dataset_id, document_id, ragflow_client)
         
-        # Create empty placeholder file
-        with open(temp_file_path, 'w', encoding='utf-8') as temp_file:
-            temp_file.write(f"Document: {document_name}\n")
+        # Create the document by uploading small in-memory placeholder content (RAGFlow requirement)
+        upload_result = ragflow_client.upload_content(
+            dataset_id, document_name, f"Document: {document_name}\n".encode('utf-8')
+        )
         
-        try:
-            # Upload file to create document
-            upload_result = ragflow_client.upload_file(dataset_id, temp_file_path)
-            
-            if isinstance(upload_result, dict) and 'data' in upload_result:
-                upload_data = upload_result['data']
-                if isinstance(upload_data, list) and len(upload_data) > 0:
-                    document_info = upload_data[0]
-                    document_id = document_info.get('id')
+        if isinstance(upload_result, dict) and 'data' in upload_result:
+            upload_data = upload_result['data']
+            if isinstance(upload_data, list) and len(upload_data) > 0:
+                document_info = upload_data[0]
+                document_id = document_info.get('id')
+                
+                if document_id:
+                    if document_cache is not None:
+                        document_cache[document_key] = document_id
                     
-                    if document_id:
-                        # Set metadata for the document - get source from semantic JSON
-                        source = data.get('source', 'Unknown')
-                        ragflow_client.set_document_metadata(
-                            dataset_id=dataset_id,
-                            document_id=document_id,
-                            source=source,
-                            timestamp=timestamp
-                        )
-                        
-                        # Use the existing working function to process chunks
-                        return process_semantic_json_data(data, dataset_id, document_id, ragflow_client)
+                    # Set metadata for the document - get source from semantic JSON
+                    source = data.get('source', 'Unknown')
+                    ragflow_client.set_document_metadata(
+                        dataset_id=dataset_id,
+                        document_id=document_id,
+                        source=source,
+                        timestamp=timestamp
+                    )
                     
-            print(f"[ERROR] Failed to create document")
-            return 0
-        
-        finally:
-            try:
-                os.unlink(temp_file_path)
-            except Exception:
-                pass
+                    # Use the existing working function to process chunks
+                    return _process_semantic_json_data(data, dataset_id, document_id, ragflow_client)
+                
+        print(f"[ERROR] Failed to create document")
+        return None
     
     except Exception as e:
         # Don't print here - let the calling code handle display with proper panels
         # This avoids duplicate ugly error messages
-        return 0
+        return None
 
 
 def process_semantic_json_data(data: Dict[str, Any], dataset_id: str, document_id: str, ragflow_client: RAGFlowClient) -> int:
     """Process semantic JSON data and upload chunks with keywords (using working ragflow-demo approach)."""
+    return _process_semantic_json_data(data, dataset_id, document_id, ragflow_client) or 0
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether a request failed because RAGFlow answered 404."""
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code == 404
+
+
+def _process_semantic_json_data(data: Dict[str, Any], dataset_id: str, document_id: str,
+                                ragflow_client: RAGFlowClient) -> Optional[int]:
+    """Upload the chunks of semantic data; None when nothing went through and RAGFlow answered 404."""
     source = data.get('source', 'Unknown')
     chunks = data.get('chunks', [])
     
@@ -493,27 +827,124 @@ def process_semantic_json_data(data: Dict[str, Any], dataset_id: str, document_i
         return 0
     
     success_count = 0
+    not_found = False
+    pending = [(i, chunk) for i, chunk in enumerate(chunks, 1) if chunk.get('content', '')]
+    pending, too_short = _drop_short_chunks(pending)
+    pending, _ = _drop_duplicate_chunks(ragflow_client, dataset_id, document_id, pending)
+    
+    for i, result in _add_chunks_concurrently(ragflow_client, dataset_id, document_id, pending):
+        if isinstance(result, Exception):
+            print(f"  [ERROR] RAG chunk {i}/{len(chunks)} failed: {result}")
+            not_found = not_found or _is_not_found(result)
+        else:
+            success_count += 1
+    
+    if too_short:
+        print_info(f"Skipped {len(too_short)} chunks shorter than {MIN_CHUNK_CHARS} characters")
+    if not success_count and not_found:
+        return None
+    return success_count
+
+
+def _content_digest(content: str) -> bytes:
+    """Short content hash used to recognise duplicate chunks."""
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+
+def _drop_short_chunks(pending: List[tuple]) -> tuple:
+    """
+    Remove chunks whose stripped content is shorter than MIN_CHUNK_CHARS.
     
-    for i, chunk in enumerate(chunks, 1):
-        content = chunk.get('content', '')
-        keywords = chunk.get('keywords', [])
+    Args:
+        pending: (index, chunk) pairs with non-empty content
         
-        if not content:
-            continue
+    Returns:
+        (remaining (index, chunk) pairs, indices of skipped chunks)
+    """
+    if MIN_CHUNK_CHARS <= 0:
+        return pending, []
+    
+    kept = []
+    skipped = []
+    for i, chunk in pending:
+        if len(chunk.get('content', '').strip()) < MIN_CHUNK_CHARS:
+            skipped.append(i)
+        else:
+            kept.append((i, chunk))
+    return kept, skipped
+
+
+def _drop_duplicate_chunks(ragflow_client: RAGFlowClient, dataset_id: str, document_id: str,
+                           pending: List[tuple]) -> tuple:
+    """
+    Remove chunks whose content repeats an earlier chunk or one already added to the document.
+    
+    Args:
+        ragflow_client: Client that remembers chunks it has added
+        dataset_id: Target dataset ID
+        document_id: Target document ID
+        pending: (index, chunk) pairs with non-empty content
         
+    Returns:
+        (first occurrences as (index, chunk) pairs, indices of skipped duplicates)
+    """
+    unique = []
+    duplicates = []
+    seen = set()
+    
+    for i, chunk in pending:
+        digest = _content_digest(chunk.get('content', ''))
+        if digest in seen or ragflow_client.has_uploaded_chunk(dataset_id, document_id, digest):
+            duplicates.append(i)
+        else:
+            seen.add(digest)
+            unique.append((i, chunk))
+    
+    return unique, duplicates
+
+
+def _add_chunks_concurrently(ragflow_client: RAGFlowClient, dataset_id: str, document_id: str,
+                             pending: List[tuple]):
+    """
+    Add chunks with up to RAGFLOW_CONCURRENCY requests in flight.
+    
+    Args:
+        ragflow_client: Client used for the add_chunk calls
+        dataset_id: Target dataset ID
+        document_id: Target document ID
+        pending: (index, chunk) pairs with non-empty content
+        
+    Yields:
+        (index, add_chunk response or the exception it raised), in input order
+    """
+    def add(item):
+        i, chunk = item
         try:
             # Use the exact working approach from ragflow-demo
+            content = chunk.get('content', '')
             result = ragflow_client.add_chunk(
                 dataset_id=dataset_id,
                 document_id=document_id,
                 content=content,
-                important_keywords=keywords
+                important_keywords=chunk.get('keywords', [])
             )
-            success_count += 1
-            
+            chunk_data = result.get('data') if isinstance(result, dict) else None
+            chunk_id = chunk_data.get('id') if isinstance(chunk_data, dict) else None
+            ragflow_client.remember_uploaded_chunk(dataset_id, document_id, _content_digest(content), chunk_id)
+            return i, result
         except Exception as e:
-            print(f"  [ERROR] RAG chunk {i}/{len(chunks)} failed: {e}")
-    return success_count
+            return i, e
+    
+    try:
+        if RAGFLOW_CONCURRENCY <= 1 or len(pending) <= 1:
+            yield from map(add, pending)
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(RAGFLOW_CONCURRENCY, len(pending))) as executor:
+            yield from executor.map(add, pending)
+    finally:
+        # One ledger transaction per file
+        ragflow_client.commit_uploaded_chunks()
 
 
 def upload_from_semantic_dir(dataset_id: str, document_id: str, 
@@ -544,29 +975,22 @@ def upload_from_semantic_dir(dataset_id: str, document_id: str,
     print(f"📂 Processing semantic chunks from: {semantic_dir}")
     
     # Initialize RAGFlow client
-    ragflow_client = RAGFlowClient(RAGFLOW_API_KEY, RAGFLOW_BASE_URL)
+    _require_env()
+    ragflow_client = RAGFlowClient(RAGFLOW_API_KEY, RAGFLOW_BASE_URL, _open_chunk_ledger())
     
-    # Find all JSON files
-    json_files = []
+    # Find all JSON files (glob walks the tree with scandir under the hood)
+    root = Path(semantic_dir)
     
     if domain_filter:
         # Process specific domain
-        domain_dir = os.path.join(semantic_dir, domain_filter)
-        if os.path.exists(domain_dir):
-            for file in os.listdir(domain_dir):
-                if file.endswith('.json'):
-                    json_files.append(os.path.join(domain_dir, file))
-        else:
+        domain_dir = root / domain_filter
+        if not domain_dir.is_dir():
             print(f"❌ Domain directory not found: {domain_dir}")
             return 0
+        json_files = [str(path) for path in domain_dir.glob('*.json')]
     else:
         # Process all domains
-        for domain in os.listdir(semantic_dir):
-            domain_dir = os.path.join(semantic_dir, domain)
-            if os.path.isdir(domain_dir):
-                for file in os.listdir(domain_dir):
-                    if file.endswith('.json'):
-                        json_files.append(os.path.join(domain_dir, file))
+        json_files = [str(path) for path in root.glob('*/*.json')]
     
     if not json_files:
         print(f"❌ No JSON files found")
@@ -576,13 +1000,24 @@ def upload_from_semantic_dir(dataset_id: str, document_id: str,
     
     total_chunks = 0
     
-    for json_file in json_files:
-        chunks_uploaded = process_semantic_json(json_file, dataset_id, document_id, ragflow_client)
+    # Parse the next files on a producer thread while the current one uploads;
+    # the bounded queue keeps at most a few parsed files in memory
+    parsed = queue.Queue(maxsize=4)
+    
+    def produce():
+        for json_file in json_files:
+            try:
+                data = _load_json_file(json_file)
+            except Exception as e:
+                data = e
+            parsed.put((json_file, data))
+    
+    threading.Thread(target=produce, daemon=True).start()
+    
+    for _ in json_files:
+        json_file, data = parsed.get()
+        chunks_uploaded = process_semantic_json(json_file, dataset_id, document_id, ragflow_client, data=data)
         total_chunks += chunks_uploaded
-        
-        # Small delay between files
-        import time
-        time.sleep(1)
     
     print(f"\n🎉 Upload complete: {total_chunks} total chunks uploaded from {len(json_files)} files")
     return total_chunks
@@ -610,23 +1045,19 @@ def upload_single_file_streaming(json_path: str) -> int:
         domain = path_parts[-2]     # domain directory
         
         # Load the JSON data
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_json_file(json_path)
         
         # Upload using the new method with original filename
         return upload_chunks_from_data(data, timestamp, domain, json_path)
         
     except Exception as e:
         print(f"[ERROR] Error in streaming upload for {json_path}: {e}")
-        import traceback
         traceback.print_exc()
         return 0
 
 
 def main():
     """Main function for command-line usage."""
-    import argparse
-    
     parser = argparse.ArgumentParser(description='Upload semantic chunks to RAGFlow with automatic dataset/document creation')
     parser.add_argument('--timestamp', help='Specific timestamp directory (uses latest if not specified)')
     parser.add_argument('--domain', help='Filter by specific domain (e.g., devices.myt.mu)')
@@ -635,6 +1066,7 @@ def main():
     args = parser.parse_args()
     
     try:
+        _require_env()
         if args.file:
             # Single file upload (streaming mode)
             total = upload_single_file_streaming(args.file)
@@ -651,7 +1083,6 @@ def main():
             
     except Exception as e:
         print(f"\n❌ Fatal error: {e}")
-        import traceback
         traceback.print_exc()
         return 1
     
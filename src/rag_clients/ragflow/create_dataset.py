@@ -3,75 +3,7 @@
 Create dataset functionality for RAGFlow using direct API calls.
 """
 
-import requests
-import time
-import urllib3
-import logging
-from typing import Optional
-
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-
-class RAGFlowClient:
-    def __init__(self, api_key: str, base_url: str = "https://rag-chat.innov.mt"):
-        self.api_key = api_key
-        self.base_url = base_url.rstrip('/')
-        self.headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-    
-    def get_datasets(self) -> list:
-        """Get all existing datasets."""
-        try:
-            response = requests.get(f"{self.base_url}/api/v1/datasets", headers=self.headers, verify=False)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.ConnectionError as e:
-            # Don't log here - let the calling code handle the display to avoid duplicates
-            if "getaddrinfo failed" in str(e) or "NameResolutionError" in str(e):
-                raise Exception("RAGFlow server unreachable - upload failed") from None
-            else:
-                raise Exception("RAGFlow connection failed - upload failed") from None
-        except Exception as e:
-            logging.error(f"❌ RAGFlow API error: {e}")
-            raise
-    
-    def delete_dataset(self, dataset_id: str) -> bool:
-        """Delete a dataset by ID."""
-        data = {"ids": [dataset_id]}
-        response = requests.delete(f"{self.base_url}/api/v1/datasets", headers=self.headers, json=data, verify=False)
-        return response.status_code == 200
-    
-    def create_dataset(self, name: str, description: str = "") -> dict:
-        """Create a new dataset."""
-        data = {
-            "name": name,
-            "description": description,
-            "permission": "team"
-        }
-        try:
-            response = requests.post(f"{self.base_url}/api/v1/datasets", headers=self.headers, json=data, verify=False)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.ConnectionError as e:
-            # Don't log here - let the calling code handle the display to avoid duplicates
-            if "getaddrinfo failed" in str(e) or "NameResolutionError" in str(e):
-                raise Exception("RAGFlow server unreachable - upload failed") from None
-            else:
-                raise Exception("RAGFlow connection failed - upload failed") from None
-        except Exception as e:
-            logging.error(f"❌ RAGFlow API error: {e}")
-            raise
-    
-    def find_dataset_by_name(self, name: str) -> Optional[dict]:
-        """Find dataset by name."""
-        datasets = self.get_datasets()
-        for dataset in datasets.get('data', []):
-            if dataset.get('name') == name:
-                return dataset
-        return None
+from .add_chunk import RAGFlowClient
 
 
 def create_or_replace_dataset(api_key: str, base_url: str, dataset_name: str, description: str = "") -> dict:
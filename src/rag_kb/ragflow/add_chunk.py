@@ -7,6 +7,8 @@ import json
 import os
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 from typing import Optional
 from dotenv import load_dotenv
@@ -30,6 +32,18 @@ class RAGFlowClient:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        # One pooled session per client so consecutive calls reuse the
+        # TLS connection instead of handshaking on every request.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.verify = False
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
     def list_documents(self, dataset_id: str, keywords: str = None) -> dict:
         """List documents in a dataset."""
@@ -39,7 +53,7 @@ class RAGFlowClient:
             params['keywords'] = keywords
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, verify=False)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.ConnectionError as e:
@@ -74,7 +88,7 @@ class RAGFlowClient:
             data["questions"] = questions
         
         try:
-            response = requests.post(url, headers=self.headers, json=data, verify=False)
+            response = self.session.post(url, json=data)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.ConnectionError as e:
@@ -88,8 +102,13 @@ class RAGFlowClient:
             raise
 
 
-def process_and_upload_file(file_path: str, api_key: str, base_url: str, dataset_id: str, document_id: str) -> bool:
-    """Process a single file (JSON or MD) and immediately upload to RAGFlow."""
+def process_and_upload_file(file_path: str, api_key: str, base_url: str, dataset_id: str, document_id: str,
+                            ragflow_client: Optional[RAGFlowClient] = None) -> bool:
+    """Process a single file (JSON or MD) and immediately upload to RAGFlow.
+
+    Pass ``ragflow_client`` to reuse an existing client (and its connection
+    pool); otherwise a new one is created for this file.
+    """
     print(f"📄 Processing file: {file_path}")
     
     try:
@@ -215,7 +234,8 @@ def process_and_upload_file(file_path: str, api_key: str, base_url: str, dataset
         # Immediately upload to RAGFlow
         print(f"🔄 Uploading to RAGFlow...")
         
-        ragflow_client = RAGFlowClient(api_key, base_url)
+        if ragflow_client is None:
+            ragflow_client = RAGFlowClient(api_key, base_url)
         result = ragflow_client.add_chunk(
             dataset_id=dataset_id,
             document_id=document_id,
@@ -257,12 +277,13 @@ def process_all_files_streaming(website: str, timestamp: str, api_key: str, base
     print(f"📁 Total: {len(all_files)} files to process")
     
     success_count = 0
+    ragflow_client = RAGFlowClient(api_key, base_url)
     
     for i, filename in enumerate(all_files, 1):
         print(f"\n[{i}/{len(all_files)}] Processing {filename}")
         file_path = os.path.join(folder_path, filename)
         
-        if process_and_upload_file(file_path, api_key, base_url, dataset_id, document_id):
+        if process_and_upload_file(file_path, api_key, base_url, dataset_id, document_id, ragflow_client):
             success_count += 1
             print(f"✅ File {i}/{len(all_files)} completed successfully")
         else:
@@ -3,11 +3,13 @@ Crawler orchestrator module for coordinating all crawling operations.
 """
 
 import asyncio
+import json
+import mmap
 import yaml
 import os
 import sys
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from pathlib import Path
 
 from .web_crawler import WebCrawler
@@ -17,6 +19,19 @@ from .file_manager import FileManager
 from .pdf_processor import PDFProcessor
 from .report_generator import CrawlReportGenerator
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Output formats accepted in config, and the subset that produces markdown
+_VALID_FORMATS = frozenset({'html', 'markdown', 'md', 'docx'})
+_MARKDOWN_FORMATS = frozenset({'markdown', 'md'})
+
+# Markdown saved in place of a redirected PDF whose content was not extracted
+_PDF_PLACEHOLDER = "# Source: {url}\n\n---\n\n[PDF Document{suffix}: {pdf_url}]({pdf_url})"
+
 # Import rich console utilities
 try:
     from ..console import (
@@ -56,26 +71,34 @@ class CrawlerOrchestrator:
             config_path: Path to configuration file
         """
         self.config = self._load_config(config_path)
+        # Config sections used throughout the crawl, resolved once
+        self._crawler_cfg = self.config.get('crawler', {})
+        self._link_cfg = self.config.get('link_processing', {})
+        self._md_cfg = self.config.get('markdown_processing', {})
+        self._file_cfg = self._crawler_cfg.get('file_manager', {})
+        self._docling_cfg = self._crawler_cfg.get('docling', {})
+        self._process_pdf_links = bool(self._link_cfg.get('process_pdf_links', False))
+        self._verbose = int(self._crawler_cfg.get('verbosity', 1))  # 0 skips banners and page trace
+        # Domain name -> its configuration entries, for crawl_domain lookups
+        self._domain_index = {}
+        for domain_entry in self.config.get('domains', []):
+            if 'domain' in domain_entry:
+                self._domain_index.setdefault(domain_entry['domain'], []).append(domain_entry)
         self.current_processing_tree = None  # Store current processing tree for callbacks
         self._seen_file_hashes = {}  # Track file hashes for duplicate detection
         self.web_crawler = None
         self.html_processor = HTMLProcessor(
-            self.config.get('link_processing', {}), 
+            self._link_cfg, 
             self.config.get('html_cleaning', {})
         )
-        self.document_converter = DocumentConverter(
-            self.config.get('crawler', {}).get('docling', {}),
-            self.config.get('markdown_processing', {})
-        )
         self.file_manager = FileManager(
-            self.config.get('crawler', {}).get('file_manager', {}),
-            self.config.get('markdown_processing', {})
-        )
-        self.pdf_processor = PDFProcessor(
-            self.config.get('link_processing', {}),
-            self.config.get('markdown_processing', {}),
-            self.config.get('crawler', {}).get('docling', {})
+            self._file_cfg,
+            self._md_cfg
         )
+        # Docling-backed processors are created on first use (see properties below)
+        self._document_converter = None
+        self._pdf_processor = None
+        self._pdf_semaphore = None  # Created on first use inside the event loop
         
         # Initialize semantic processor for separate process handling
         self.semantic_processor = None
@@ -84,7 +107,7 @@ class CrawlerOrchestrator:
         
         # Initialize report generator
         self.report_generator = CrawlReportGenerator(
-            self.config.get('crawler', {}).get('file_manager', {}).get('report_output_dir', 'crawled_report')
+            self._file_cfg.get('report_output_dir', 'crawled_report')
         )
         
         # Initialize RAG uploader
@@ -99,10 +122,28 @@ class CrawlerOrchestrator:
         
         # Initialize progress formatter
         
+    @property
+    def document_converter(self) -> DocumentConverter:
+        """Docling document converter, created on first non-HTML conversion."""
+        if self._document_converter is None:
+            self._document_converter = DocumentConverter(self._docling_cfg, self._md_cfg)
+        return self._document_converter
+    
+    @property
+    def pdf_processor(self) -> PDFProcessor:
+        """PDF processor, created on the first PDF link or redirect."""
+        if self._pdf_processor is None:
+            self._pdf_processor = PDFProcessor(self._link_cfg, self._md_cfg, self._docling_cfg)
+        return self._pdf_processor
+    
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """
         Load configuration from YAML file.
         
+        The parsed result is cached in a JSON sidecar (``<config_path>.cache.json``)
+        keyed by the YAML file's mtime and size, so unchanged configs skip YAML parsing.
+        Configs that do not survive a JSON round trip unchanged are not cached.
+        
         Args:
             config_path: Path to configuration file
             
@@ -110,14 +151,46 @@ class CrawlerOrchestrator:
             Configuration dictionary
         """
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            stat = os.stat(config_path)
+        except FileNotFoundError:
+            print(f"Configuration file not found: {config_path}")
+            return {}
+        
+        cache_path = config_path + '.cache.json'
+        source_key = [stat.st_mtime_ns, stat.st_size]
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('_src_mtime') == source_key:
+                return cached['config']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass  # Missing or stale cache, parse the YAML below
+        
+        try:
+            # Hand the parser a read-only mapping of the raw bytes rather than decoded text
+            with open(config_path, 'rb') as f:
+                if stat.st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        config = yaml.load(mm, Loader=_YamlLoader)
+                else:
+                    config = {}  # mmap cannot map an empty file
         except FileNotFoundError:
             print(f"Configuration file not found: {config_path}")
             return {}
         except yaml.YAMLError as e:
             print(f"Error parsing configuration file: {e}")
             return {}
+        
+        try:
+            encoded = json.dumps({'_src_mtime': source_key, 'config': config})
+            # Only cache configs JSON reproduces exactly; non-string keys or tuples would
+            # come back changed on a cache hit, and dates cannot be encoded at all
+            if json.loads(encoded)['config'] == config:
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    f.write(encoded)
+        except (OSError, TypeError, ValueError):
+            pass  # Caching is best-effort (read-only dir or non-JSON YAML types)
+        return config
     
     def get_domains_config(self) -> List[Dict[str, Any]]:
         """
@@ -135,7 +208,7 @@ class CrawlerOrchestrator:
         Returns:
             List of output formats
         """
-        return self.config.get('crawler', {}).get('output_formats', ['html', 'markdown'])
+        return self._crawler_cfg.get('output_formats', ['html', 'markdown'])
     
     def _init_semantic_processor(self):
         """Initialize semantic processor for sequential processing."""
@@ -265,33 +338,42 @@ class CrawlerOrchestrator:
         Returns:
             Crawl4AI configuration
         """
-        return self.config.get('crawler', {}).get('crawl4ai', {})
+        return self._crawler_cfg.get('crawl4ai', {})
     
-    async def crawl_and_convert(self, output_formats: List[str] = None) -> Dict[str, Any]:
+    async def crawl_and_convert(self, output_formats: List[str] = None, *,
+                                domains_override: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Perform the complete crawling and conversion process.
         
         Args:
             output_formats: List of output formats to generate
+            domains_override: Domain configurations to crawl instead of the configured ones
             
         Returns:
             Dictionary containing process results and statistics
         """
         if output_formats is None:
             output_formats = self.get_output_formats()
+        # Normalize once so per-page format checks need no lower()
+        output_formats = [fmt.lower() for fmt in output_formats]
+        # Split once into the saved-as-is HTML and the Docling-converted formats
+        html_needed = 'html' in output_formats
+        convert_formats = tuple(fmt for fmt in output_formats if fmt != 'html')
         
         # Record start time
         start_time = datetime.now()
         
+        # Get domain configurations
+        domains = domains_override if domains_override is not None else self.get_domains_config()
+        
         # Display configuration before starting
-        self._display_startup_config(output_formats)
+        if self._verbose >= 1:
+            self._display_startup_config(output_formats, domains)
+            self._display_directory_setup()
         
-        # Setup directories and show in table
-        self._display_directory_setup()
+        # Setup directories
         self.file_manager.setup_directories()
         
-        # Get domain configurations
-        domains = self.get_domains_config()
         if not domains:
             print("❌ No domains configured")
             return {'error': 'No domains configured'}
@@ -299,7 +381,7 @@ class CrawlerOrchestrator:
         # Initialize web crawler with combined config
         crawl_config = self.get_crawl4ai_config()
         # Add link processing settings to crawler config
-        link_config = self.config.get('link_processing', {})
+        link_config = self._link_cfg
         crawl_config.update({
             'exclude_urls': link_config.get('exclude_urls', []),
             'exclude_section_urls': link_config.get('exclude_section_urls', True)
@@ -314,7 +396,8 @@ class CrawlerOrchestrator:
         domain_names = [d['domain'] for d in domains]
         
         # Display crawl settings in table
-        self._display_crawl_settings(crawl_config)
+        if self._verbose >= 1:
+            self._display_crawl_settings(crawl_config)
         
         async with WebCrawler(crawl_config, None) as crawler:
             # Set up semantic queue callback for checkpointing
@@ -342,10 +425,13 @@ class CrawlerOrchestrator:
                     # If no semantic queue data but we have checkpoint, scan for unprocessed files
                     self._scan_and_queue_unprocessed_semantic_files()
             
-            # Process pages as they are crawled (streaming approach)
+            # Process pages as they are crawled (streaming approach). A bounded queue lets the
+            # crawler fetch the next pages while the current one is being converted and saved.
+            page_queue = asyncio.Queue(maxsize=max(1, crawl_config.get('page_queue_size', 8)))
+            producer = asyncio.create_task(self._produce_crawl_results(crawler, domains, page_queue))
             page_count = 0
             try:
-                async for crawl_result in crawler.crawl_all_streaming(domains):
+                while (crawl_result := await page_queue.get()) is not None:
                     page_count += 1
                     try:
                         # Create and display tree for page processing
@@ -354,18 +440,24 @@ class CrawlerOrchestrator:
                         
                         if RICH_AVAILABLE:
                             # Use rich tree display following Rich patterns
-                            processing_tree = create_page_processing_tree(page_count, queue_size, current_domain, crawl_result['url'])
+                            # Pages still to process (buffered + frontier), bounded by max_pages
+                            total_pages = min(page_count + page_queue.qsize() + len(crawler.queue), max_pages)
+                            processing_tree = create_page_processing_tree(
+                                page_count, queue_size, current_domain, crawl_result['url'],
+                                total_pages=total_pages
+                            )
                             self.current_processing_tree = processing_tree  # Store for callbacks
                         else:
                             # Fallback to old style
                             processing_tree = None
-                            print_immediate(f"\n┌─ 🗺️  Processing Page {page_count} of ∞")
-                            print_immediate(f"│  ┌─ 📊 Queue Status: {queue_size} URLs remaining")
-                            print_immediate(f"│  ├─ 🌐 Domain: {current_domain}")
-                            print_immediate(f"│  └─   URL: {crawl_result['url']}")
-                            print_immediate(f"│")
+                            if self._verbose >= 1:
+                                print_immediate(f"\n┌─ 🗺️  Processing Page {page_count} of ∞")
+                                print_immediate(f"│  ┌─ 📊 Queue Status: {queue_size} URLs remaining")
+                                print_immediate(f"│  ├─ 🌐 Domain: {current_domain}")
+                                print_immediate(f"│  └─   URL: {crawl_result['url']}")
+                                print_immediate(f"│")
                         
-                        await self._process_single_page(crawl_result, output_formats, processing_tree)
+                        await self._process_single_page(crawl_result, html_needed, convert_formats, processing_tree)
                         results['processed_pages'].append(crawl_result['url'])
                         
                         # Check if it was a PDF redirect
@@ -376,7 +468,7 @@ class CrawlerOrchestrator:
                         if RICH_AVAILABLE:
                             # Print the complete tree at the end
                             print_processing_tree_final(processing_tree, page_count, current_domain)
-                        else:
+                        elif self._verbose >= 1:
                             print_immediate(f"│  └─ ✅  Page {page_count} complete")
                             print_immediate(f"└─ {'═' * 50}")  # Enhanced separator between pages
                     except Exception as e:
@@ -387,11 +479,22 @@ class CrawlerOrchestrator:
                         results['errors'].append(error_info)
                         print_immediate(f"│  └─ ❌ Error: {str(e)[:80]}...")
                         print_immediate(f"└─ {'═' * 50}")
+                    # The page is done, so later checkpoints may record it as visited
+                    crawler.mark_page_saved(crawl_result.get('crawl_url'))
+                
+                # Surface any crawler error that ended the stream
+                await producer
             except Exception as e:
                 print(f"\n⚠️ Crawler stopped unexpectedly after {page_count} pages")
                 print(f"   Error: {str(e)[:200]}")
                 # Continue with cleanup even if crawler crashes
             finally:
+                if not producer.done():
+                    producer.cancel()
+                    try:
+                        await producer
+                    except (asyncio.CancelledError, Exception):
+                        pass
                 # Ensure the live panel is stopped and the terminal is restored
                 if RICH_AVAILABLE:
                     try:
@@ -400,7 +503,7 @@ class CrawlerOrchestrator:
                         pass
             
             # Save failed URLs if any
-            if hasattr(crawler, 'failed_urls') and crawler.failed_urls:
+            if crawler.failed_urls:
                 crawler.save_failed_urls()
                 results['failed_urls'] = len(crawler.failed_urls)
             
@@ -411,7 +514,7 @@ class CrawlerOrchestrator:
         results['stats'] = self.file_manager.get_output_stats()
         
         # Clean up only blank files if enabled (duplicates handled per-file during processing)
-        markdown_config = self.config.get('markdown_processing', {})
+        markdown_config = self._md_cfg
         if markdown_config.get('remove_blank_files', False):
             # Call with skip_duplicates=True since we handle duplicates per-file now
             cleanup_stats = self.file_manager.remove_duplicate_and_blank_files(skip_duplicates=True)
@@ -431,7 +534,7 @@ class CrawlerOrchestrator:
                 not self.rag_uploader.streaming):
                 try:
                     # Get the semantic output directory with timestamp
-                    semantic_dir = self.config.get('crawler', {}).get('file_manager', {}).get('semantic_output_dir', 'crawled_semantic')
+                    semantic_dir = self._file_cfg.get('semantic_output_dir', 'crawled_semantic')
                     # Find the latest timestamp directory
                     import os
                     if os.path.exists(semantic_dir):
@@ -445,13 +548,17 @@ class CrawlerOrchestrator:
                             semantic_timestamped_dir = os.path.join(semantic_dir, latest_timestamp)
                             
                             print("   📤 Starting batch RAG upload...")
-                            chunks_uploaded = self.rag_uploader.upload_from_directory(semantic_timestamped_dir)
+                            # Blocking HTTP uploads run off the event loop
+                            chunks_uploaded = await asyncio.to_thread(
+                                self.rag_uploader.upload_from_directory, semantic_timestamped_dir
+                            )
                             if chunks_uploaded > 0:
                                 results['rag_chunks_uploaded'] = chunks_uploaded
                 except Exception as e:
                     print(f"   ❌ Failed to upload to RAG system: {e}")
             elif (self.rag_uploader and self.rag_uploader.is_enabled() and 
                   self.rag_uploader.streaming):
+                self.rag_uploader.save_id_cache()
                 print("   🚀 RAG upload completed via real-time streaming")
         
         # Record end time
@@ -472,31 +579,52 @@ class CrawlerOrchestrator:
         # Show final summary using progress formatter
         # Show final summary
         print_success("Crawling completed! 🎉")
-        print(f"✅ Successfully processed: {len(results['processed_pages'])} pages")
+        summary_lines = [f"✅ Successfully processed: {len(results['processed_pages'])} pages"]
         if results['errors']:
-            print(f"❌ Processing errors: {len(results['errors'])} pages")
+            summary_lines.append(f"❌ Processing errors: {len(results['errors'])} pages")
         if results.get('failed_urls', 0) > 0:
-            print(f"🔄 Failed after retries: {results['failed_urls']} pages (saved to failed_urls.txt)")
+            summary_lines.append(f"🔄 Failed after retries: {results['failed_urls']} pages (saved to failed_urls.txt)")
         if results.get('rag_chunks_uploaded', 0) > 0:
-            print(f"📤 RAG chunks uploaded: {results['rag_chunks_uploaded']}")
+            summary_lines.append(f"📤 RAG chunks uploaded: {results['rag_chunks_uploaded']}")
         elif (self.rag_uploader and self.rag_uploader.is_enabled() and 
               self.rag_uploader.streaming):
-            print(f"🚀 RAG upload completed via streaming")
+            summary_lines.append(f"🚀 RAG upload completed via streaming")
             
         duration = end_time - start_time
-        print(f"⏱️ Total time: {duration}")
+        summary_lines.append(f"⏱️ Total time: {duration}")
+        print_immediate("\n".join(summary_lines))
         
         return results
     
+    async def _produce_crawl_results(self, crawler: WebCrawler, domains: List[Dict[str, Any]],
+                                     page_queue: asyncio.Queue) -> None:
+        """
+        Feed crawled pages into the page queue, ending with a None sentinel.
+        
+        Args:
+            crawler: Active web crawler
+            domains: Domain configurations to crawl
+            page_queue: Bounded queue consumed by crawl_and_convert
+        """
+        try:
+            async for crawl_result in crawler.crawl_all_streaming(domains):
+                await page_queue.put(crawl_result)
+        except Exception:
+            # Unblock the consumer, then let it pick up the error by awaiting this task
+            await page_queue.put(None)
+            raise
+        await page_queue.put(None)
+    
     def _cleanup_checkpoint(self):
         """Clean up checkpoint file after successful completion."""
-        import os
-        if os.path.exists('crawler_checkpoint.json'):
-            try:
-                os.remove('crawler_checkpoint.json')
-                print("   🗑️ Cleanup: Removed checkpoint file")
-            except Exception as e:
-                print(f"   ⚠️ Could not remove checkpoint file: {e}")
+        try:
+            Path('crawler_checkpoint.json').unlink()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"   ⚠️ Could not remove checkpoint file: {e}")
+            return
+        print("   🗑️ Cleanup: Removed checkpoint file")
     
     def get_semantic_queue_for_checkpoint(self):
         """Get current semantic queue state for checkpoint saving."""
@@ -584,7 +712,7 @@ class CrawlerOrchestrator:
             True if file should be processed further, False if it's a duplicate
         """
         # Only check duplicates if enabled in config
-        markdown_config = self.config.get('markdown_processing', {})
+        markdown_config = self._md_cfg
         if not markdown_config.get('remove_duplicate_files', False):
             return True
             
@@ -688,20 +816,23 @@ class CrawlerOrchestrator:
     def _display_crawl_settings(self, crawl_config: Dict[str, Any]) -> None:
         """Display crawl configuration settings in a table."""
         if not RICH_AVAILABLE:
-            # Fallback to old style
-            print(f"📊 Max pages per domain: {crawl_config.get('max_pages', 100)}")
-            print(f"⏱️  Delay before HTML capture: {crawl_config.get('delay_before_return_html', 2.5)}s")
-            print(f"🔄 Bypass cache: {crawl_config.get('bypass_cache', True)}")
-            print(f"🚫 Exclude section URLs (#): {crawl_config.get('exclude_section_urls', True)}")
-            print(f"🔁 Max retries per page: {crawl_config.get('max_retries', 3)}")
-            print(f"⏰ Retry delay: {crawl_config.get('retry_delay', 5)}s")
-            print("-" * 60)
+            # Fallback to old style, built up front and written in one call
+            lines = [
+                f"📊 Max pages per domain: {crawl_config.get('max_pages', 100)}",
+                f"⏱️  Delay before HTML capture: {crawl_config.get('delay_before_return_html', 2.5)}s",
+                f"🔄 Bypass cache: {crawl_config.get('bypass_cache', True)}",
+                f"🚫 Exclude section URLs (#): {crawl_config.get('exclude_section_urls', True)}",
+                f"🔁 Max retries per page: {crawl_config.get('max_retries', 3)}",
+                f"⏰ Retry delay: {crawl_config.get('retry_delay', 5)}s",
+                "-" * 60,
+            ]
+            print_immediate("\n".join(lines))
             return
         
         # Rich UI is merged in Configuration Summary; suppress duplicate output
         return
     
-    def _display_startup_config(self, output_formats: List[str]) -> None:
+    def _display_startup_config(self, output_formats: List[str], domains: List[Dict[str, Any]]) -> None:
         """Display configuration information before starting crawl."""
         if not RICH_AVAILABLE:
             # Suppress verbose banner in non-rich mode
@@ -709,9 +840,8 @@ class CrawlerOrchestrator:
             # Suppress standalone header to keep UI concise
         
         # Build a single consolidated table
-        file_config = self.config.get('crawler', {}).get('file_manager', {})
-        domains = self.get_domains_config()
-        markdown_processing = self.config.get('markdown_processing', {})
+        file_config = self._file_cfg
+        markdown_processing = self._md_cfg
         rag_config = self.config.get('rag_upload', {})
         crawl_config = self.get_crawl4ai_config()
         
@@ -786,13 +916,33 @@ class CrawlerOrchestrator:
         
         console.print(table)
     
-    async def _process_single_page(self, crawl_result: Dict[str, Any], output_formats: List[str], processing_tree = None) -> None:
+    async def _save_pdf_placeholder(self, url: str, pdf_url: str, suffix: str) -> str:
+        """
+        Save a placeholder markdown file linking to a redirected PDF, in a worker thread.
+        
+        Args:
+            url: Page URL that redirected to the PDF
+            pdf_url: URL of the PDF document
+            suffix: Reason appended to the link text, e.g. " (processing disabled)"
+            
+        Returns:
+            Path to saved file
+        """
+        return await asyncio.to_thread(
+            self.file_manager.save_markdown,
+            url,
+            _PDF_PLACEHOLDER.format(url=url, pdf_url=pdf_url, suffix=suffix)
+        )
+    
+    async def _process_single_page(self, crawl_result: Dict[str, Any], html_needed: bool,
+                                   convert_formats: Tuple[str, ...], processing_tree = None) -> None:
         """
         Process a single crawled page.
         
         Args:
             crawl_result: Result from web crawler
-            output_formats: List of output formats to generate
+            html_needed: Whether the processed HTML is saved as an output
+            convert_formats: Lower-cased formats to generate with Docling
         """
         url = crawl_result['url']
         html_content = crawl_result['html']
@@ -807,20 +957,22 @@ class CrawlerOrchestrator:
                 print_immediate(f"│  ├─ 📥 Redirected to PDF document")
             
             # Process the PDF if enabled
-            if self.config.get('link_processing', {}).get('process_pdf_links', False):
+            if self._process_pdf_links:
                 try:
                     if processing_tree is not None:
                         add_processing_step(processing_tree, "processing", "📥 Downloading and processing PDF...")
                     else:
                         print(f"   📥 Downloading and processing PDF...")
                     # Download and process the PDF - pass list of formats
-                    pdf_formats = [fmt for fmt in output_formats if fmt.lower() in ['markdown', 'md']]
+                    pdf_formats = [fmt for fmt in convert_formats if fmt in _MARKDOWN_FORMATS]
                     if pdf_formats:
-                        pdf_result = self.pdf_processor.process_pdf_url(pdf_url, pdf_formats)
+                        # Download, extraction and saving run in worker threads to keep the loop free
+                        pdf_result = await asyncio.to_thread(self.pdf_processor.process_pdf_url, pdf_url, pdf_formats)
                         if pdf_result['success']:
                             for format, content in pdf_result['content'].items():
                                 # Save with original URL as reference
-                                saved_path = self.file_manager.save_pdf_content(
+                                saved_path = await asyncio.to_thread(
+                                    self.file_manager.save_pdf_content,
                                     pdf_url,
                                     pdf_result['filename'],
                                     content,
@@ -833,7 +985,7 @@ class CrawlerOrchestrator:
                                 
                                 # Start semantic chunking for PDF markdown content
                                 if (self.is_contextual_chunking_enabled() and 
-                                    format.lower() in ['markdown', 'md']):
+                                    format in _MARKDOWN_FORMATS):
                                     try:
                                         # Generate timestamped semantic output path using file manager
                                         import os
@@ -855,18 +1007,15 @@ class CrawlerOrchestrator:
                         else:
                             print(f"   ⚠️ No content extracted from PDF")
                             # Save placeholder only if PDF extraction failed
-                            placeholder_content = f"# Source: {url}\n\n---\n\n[PDF Document could not be extracted: {pdf_url}]({pdf_url})"
-                            self.file_manager.save_markdown(url, placeholder_content)
+                            await self._save_pdf_placeholder(url, pdf_url, " could not be extracted")
                 except Exception as e:
                     print(f"   ❌ Error processing PDF: {e}")
                     # Save placeholder on error
-                    placeholder_content = f"# Source: {url}\n\n---\n\n[PDF Document (error during extraction): {pdf_url}]({pdf_url})"
-                    self.file_manager.save_markdown(url, placeholder_content)
+                    await self._save_pdf_placeholder(url, pdf_url, " (error during extraction)")
             else:
                 print(f"   ⚠️ PDF processing is disabled in config")
                 # Save placeholder when PDF processing is disabled
-                placeholder_content = f"# Source: {url}\n\n---\n\n[PDF Document (processing disabled): {pdf_url}]({pdf_url})"
-                self.file_manager.save_markdown(url, placeholder_content)
+                await self._save_pdf_placeholder(url, pdf_url, " (processing disabled)")
             return
         
         # Process HTML for document conversion (this includes domain-specific cleaning)
@@ -876,98 +1025,122 @@ class CrawlerOrchestrator:
             domain_config
         )
         
-        # Save domain-cleaned HTML
-        self.file_manager.save_html(url, processed_result['processed_html'], processing_tree)
-        
-        # Convert to requested formats
-        for output_format in output_formats:
-            if output_format.lower() == 'html':
-                # Save processed HTML
-                self.file_manager.save_content(
-                    url, 
-                    processed_result['processed_html'], 
-                    'html',
-                    None,  # no conversion time for HTML
-                    processing_tree
-                )
-            else:
-                # Convert using Docling
-                converted_content, conversion_time, fallback_message = self.document_converter.convert_with_cleanup(
-                    processed_result['temp_file_path'], 
-                    output_format,
-                    url
-                )
-                
-                # Add fallback warning to console tree if fallback was used
-                if fallback_message:
-                    if RICH_AVAILABLE:
-                        add_processing_step(processing_tree, "fallback_panel", fallback_message)
+        # Save domain-cleaned HTML (and the processed HTML output, which needs no conversion)
+        # before converting, so a conversion that raises cannot lose it
+        html_outputs = [(processed_result['processed_html'], 'html', None)] if html_needed else []
+        await asyncio.to_thread(
+            self.file_manager.save_batch,
+            url,
+            processed_result['processed_html'],
+            html_outputs,
+            processing_tree
+        )
+        
+        # Convert all non-HTML formats in a worker thread from one Docling parse; files are
+        # written together afterwards. Docling reads the processed HTML from memory, so no
+        # temp file is written
+        conversions = await asyncio.to_thread(
+            self.document_converter.convert_bytes_to_formats, processed_result['bytes'], convert_formats, url
+        ) if convert_formats else []
+        
+        pending_outputs = []
+        for output_format, (converted_content, conversion_time, fallback_message) in zip(convert_formats, conversions):
+            # Add fallback warning to console tree if fallback was used
+            if fallback_message:
+                if RICH_AVAILABLE:
+                    add_processing_step(processing_tree, "fallback_panel", fallback_message)
+                else:
+                    print(f"│  ├─ ⚠️ {fallback_message}")  # Fallback if console not available
+            
+            pending_outputs.append((converted_content, output_format, conversion_time))
+        
+        # Save all converted outputs in one worker-thread batch
+        saved_paths = await asyncio.to_thread(
+            self.file_manager.save_batch,
+            url,
+            None,
+            pending_outputs,
+            processing_tree
+        )
+        
+        for (_, output_format, _), saved_path in zip(pending_outputs, saved_paths):
+            if output_format not in _MARKDOWN_FORMATS:
+                continue
+            
+            # Check if this file is a duplicate before processing semantically
+            should_process_semantically = self._check_and_handle_duplicate(saved_path, processing_tree)
+            
+            # Start semantic chunking in separate process if enabled and format is markdown
+            if self.is_contextual_chunking_enabled() and should_process_semantically:
+                try:
+                    # Generate timestamped semantic output path using file manager
+                    import os
+                    semantic_filename = os.path.basename(saved_path).replace('.md', '.json')
+                    domain_folder = os.path.dirname(saved_path).split(os.sep)[-1]
+                    semantic_domain_dir = os.path.join(self.file_manager.current_semantic_dir, domain_folder)
+                    os.makedirs(semantic_domain_dir, exist_ok=True)
+                    semantic_output_path = os.path.join(semantic_domain_dir, semantic_filename)
+                    self.semantic_processor.add_task(saved_path, semantic_output_path, url)
+                    # Increment queue counter and show status
+                    self.semantic_queue_count += 1
+                    # Get actual queue size from semantic processor for accurate display
+                    total_pending = self.semantic_processor.get_queue_size()
+                    filename = Path(saved_path).name
+                    if processing_tree is not None:
+                        # Show progress panel after adding task (includes queued message in title)
+                        try:
+                            status = self.semantic_processor.get_status()
+                            progress_message = f"{status['completed']},{status['failed']},{status['total']},{filename}"
+                            add_processing_step(processing_tree, "semantic_progress_panel", progress_message)
+                        except:
+                            pass
                     else:
-                        print(f"│  ├─ ⚠️ {fallback_message}")  # Fallback if console not available
-                
-                # Save converted content
-                saved_path = self.file_manager.save_content(url, converted_content, output_format, conversion_time, processing_tree)
-                
-                # Check if this file is a duplicate before processing semantically
-                should_process_semantically = True
-                if output_format.lower() in ['markdown', 'md']:
-                    should_process_semantically = self._check_and_handle_duplicate(saved_path, processing_tree)
-                
-                # Start semantic chunking in separate process if enabled and format is markdown
-                if (self.is_contextual_chunking_enabled() and 
-                    output_format.lower() in ['markdown', 'md'] and 
-                    should_process_semantically):
-                    try:
-                        # Generate timestamped semantic output path using file manager
-                        import os
-                        semantic_filename = os.path.basename(saved_path).replace('.md', '.json')
-                        domain_folder = os.path.dirname(saved_path).split(os.sep)[-1]
-                        semantic_domain_dir = os.path.join(self.file_manager.current_semantic_dir, domain_folder)
-                        os.makedirs(semantic_domain_dir, exist_ok=True)
-                        semantic_output_path = os.path.join(semantic_domain_dir, semantic_filename)
-                        self.semantic_processor.add_task(saved_path, semantic_output_path, url)
-                        # Increment queue counter and show status
-                        self.semantic_queue_count += 1
-                        # Get actual queue size from semantic processor for accurate display
-                        total_pending = self.semantic_processor.get_queue_size()
-                        filename = Path(saved_path).name
-                        if processing_tree is not None:
-                            # Show progress panel after adding task (includes queued message in title)
-                            try:
-                                status = self.semantic_processor.get_status()
-                                progress_message = f"{status['completed']},{status['failed']},{status['total']},{filename}"
-                                add_processing_step(processing_tree, "semantic_progress_panel", progress_message)
-                            except:
-                                pass
-                        else:
-                            print_immediate(f"│  ├─ 🧠 Queued for semantic processing")
-                    except Exception as e:
-                        print_immediate(f"   ❌ Semantic chunking error for {url}: {e}")
+                        print_immediate(f"│  ├─ 🧠 Queued for semantic processing")
+                except Exception as e:
+                    print_immediate(f"   ❌ Semantic chunking error for {url}: {e}")
         
         # Process PDF URLs if any were found
         if 'pdf_urls' in crawl_result and crawl_result['pdf_urls']:
-            await self._process_pdf_urls(crawl_result['pdf_urls'], output_formats)
+            pdf_formats = ['html', *convert_formats] if html_needed else list(convert_formats)
+            await self._process_pdf_urls(crawl_result['pdf_urls'], pdf_formats)
         
         # Check for completed semantic tasks
         self._check_semantic_progress(processing_tree)
     
+    async def _fetch_pdf(self, pdf_url: str, output_formats: List[str]) -> Dict[str, Any]:
+        """Download and extract a PDF in a worker thread, bounded by the PDF semaphore."""
+        async with self._pdf_semaphore:
+            return await asyncio.to_thread(self.pdf_processor.process_pdf_url, pdf_url, output_formats)
+    
     async def _process_pdf_urls(self, pdf_urls: List[str], output_formats: List[str]) -> None:
         """
         Process PDF URLs by downloading and extracting content.
         
+        Downloads and extraction run concurrently (up to ``link_processing.pdf_concurrency``
+        at a time); results are then saved in worker threads and queued for semantic chunking.
+        
         Args:
             pdf_urls: List of PDF URLs to process
             output_formats: List of output formats to generate
         """
-        for pdf_url in pdf_urls:
+        if self._pdf_semaphore is None:
+            self._pdf_semaphore = asyncio.Semaphore(max(1, self._link_cfg.get('pdf_concurrency', 4)))
+        
+        results = await asyncio.gather(
+            *(self._fetch_pdf(pdf_url, output_formats) for pdf_url in pdf_urls),
+            return_exceptions=True
+        )
+        
+        for pdf_url, result in zip(pdf_urls, results):
+            if isinstance(result, Exception):
+                print(f"   ❌ Error processing PDF {pdf_url}: {result}")
+                continue
             try:
-                # Process PDF
-                result = self.pdf_processor.process_pdf_url(pdf_url, output_formats)
-                
                 if result['success']:
                     # Save content for each format
                     for format_name, content in result['content'].items():
-                        saved_path = self.file_manager.save_pdf_content(
+                        saved_path = await asyncio.to_thread(
+                            self.file_manager.save_pdf_content,
                             pdf_url, 
                             result['filename'], 
                             content, 
@@ -976,7 +1149,7 @@ class CrawlerOrchestrator:
                         
                         # Start semantic chunking for PDF markdown content
                         if (self.is_contextual_chunking_enabled() and 
-                            format_name.lower() in ['markdown', 'md']):
+                            format_name in _MARKDOWN_FORMATS):
                             try:
                                 # Generate timestamped semantic output path using file manager
                                 import os
@@ -1005,22 +1178,11 @@ class CrawlerOrchestrator:
         Returns:
             Dictionary containing process results
         """
-        # Filter domains configuration for specific domain
-        domains = self.get_domains_config()
-        domain_config = [d for d in domains if d['domain'] == domain]
-        
-        if not domain_config:
+        domain_config = self._domain_index.get(domain)
+        if domain_config is None:
             return {'error': f'Domain {domain} not found in configuration'}
         
-        # Temporarily update domains configuration
-        original_domains = self.config.get('domains', [])
-        self.config['domains'] = domain_config
-        
-        try:
-            return await self.crawl_and_convert(output_formats)
-        finally:
-            # Restore original configuration
-            self.config['domains'] = original_domains
+        return await self.crawl_and_convert(output_formats, domains_override=domain_config)
     
     def validate_config(self) -> List[str]:
         """
@@ -1048,9 +1210,8 @@ class CrawlerOrchestrator:
         
         # Check output formats
         output_formats = self.get_output_formats()
-        valid_formats = ['html', 'markdown', 'md', 'docx']
         for fmt in output_formats:
-            if fmt.lower() not in valid_formats:
+            if fmt.lower() not in _VALID_FORMATS:
                 errors.append(f"Invalid output format: {fmt}")
         
         return errors
@@ -1059,10 +1220,8 @@ class CrawlerOrchestrator:
         """Print a summary of the current configuration."""
         if not RICH_AVAILABLE:
             # Fallback to old style
-            print("\n=== Configuration Summary ===")
             domains = self.get_domains_config()
-            print(f"Configured domains: {len(domains)}")
-            print("=" * 30)
+            print_immediate(f"\n=== Configuration Summary ===\nConfigured domains: {len(domains)}\n{'=' * 30}")
             return
             
         print_header("📋 Configuration Summary")
@@ -1075,7 +1234,7 @@ class CrawlerOrchestrator:
         # Domains
         domains = self.get_domains_config()
         output_formats = self.get_output_formats()
-        file_config = self.config.get('crawler', {}).get('file_manager', {})
+        file_config = self._file_cfg
         
         table.add_row("📁 Domains", str(len(domains)))
         table.add_row("📄 Output formats", ', '.join(output_formats))
@@ -4,7 +4,11 @@ Document conversion module for handling Docling operations.
 
 import os
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from io import BytesIO
+from typing import Dict, Any, List, Optional
+from docling.datamodel.base_models import DocumentStream
 from docling.document_converter import DocumentConverter as DoclingConverter
 
 # Suppress docling INFO messages using rich logging
@@ -44,19 +48,28 @@ class DocumentConverter:
         self.config = config
         self.markdown_processing_config = markdown_processing_config or {}
         self.converter = DoclingConverter()
+        # Formats may be converted from worker threads; Docling conversions are serialized
+        self._convert_lock = threading.Lock()
     
     def convert_to_markdown(self, html_file_path: str) -> str:
         """
         Convert HTML file to Markdown format.
         
         Args:
-            html_file_path: Path to HTML file to convert
+            html_file_path: Path to HTML file, or a DocumentStream, to convert
             
         Returns:
             Markdown content as string
         """
-        conv_result = self.converter.convert(html_file_path)
-        
+        return self._export_markdown(self._convert(html_file_path))
+    
+    def _convert(self, source: Any) -> Any:
+        """Run the Docling parse; serialized because the converter is shared across threads."""
+        with self._convert_lock:
+            return self.converter.convert(source)
+    
+    def _export_markdown(self, conv_result: Any) -> str:
+        """Export a Docling conversion result as post-processed Markdown."""
         # Get markdown settings from config
         markdown_config = self.config.get('markdown', {})
         
@@ -90,13 +103,15 @@ class DocumentConverter:
         Convert HTML file to formatted HTML.
         
         Args:
-            html_file_path: Path to HTML file to convert
+            html_file_path: Path to HTML file, or a DocumentStream, to convert
             
         Returns:
             HTML content as string
         """
-        conv_result = self.converter.convert(html_file_path)
-        
+        return self._export_html(self._convert(html_file_path))
+    
+    def _export_html(self, conv_result: Any) -> str:
+        """Export a Docling conversion result as HTML."""
         # Get HTML settings from config
         html_config = self.config.get('html', {})
         
@@ -116,12 +131,15 @@ class DocumentConverter:
         Convert HTML file to DOCX format.
         
         Args:
-            html_file_path: Path to HTML file to convert
+            html_file_path: Path to HTML file, or a DocumentStream, to convert
             
         Returns:
             DOCX content as bytes
         """
-        conv_result = self.converter.convert(html_file_path)
+        return self._export_docx(self._convert(html_file_path))
+    
+    def _export_docx(self, conv_result: Any) -> bytes:
+        """Export a Docling conversion result as DOCX bytes."""
         return conv_result.document.export_to_word()
     
     def _post_process_markdown(self, markdown_content: str) -> str:
@@ -264,12 +282,12 @@ class DocumentConverter:
         else:
             return '\n'.join(result_lines)
     
-    def _simple_html_to_text(self, html_file_path: str) -> str:
+    def _simple_html_to_text(self, html_bytes: bytes) -> str:
         """
         Simple HTML to text conversion without Docling (fallback).
         
         Args:
-            html_file_path: Path to HTML file
+            html_bytes: Raw HTML content
             
         Returns:
             Simple text content
@@ -282,17 +300,14 @@ class DocumentConverter:
         
         for encoding in encodings:
             try:
-                with open(html_file_path, 'r', encoding=encoding) as f:
-                    html_content = f.read()
+                html_content = html_bytes.decode(encoding)
                 break
             except UnicodeDecodeError:
                 continue
         
         if html_content is None:
-            # Last resort: read as binary and decode with error handling
-            with open(html_file_path, 'rb') as f:
-                raw_content = f.read()
-            html_content = raw_content.decode('utf-8', errors='ignore')
+            # Last resort: decode with error handling
+            html_content = html_bytes.decode('utf-8', errors='ignore')
         
         soup = BeautifulSoup(html_content, 'html.parser')
         
@@ -312,19 +327,18 @@ class DocumentConverter:
         
         return text
     
-    def _is_problematic_content(self, html_file_path: str) -> bool:
+    def _is_problematic_content(self, html_bytes: bytes) -> bool:
         """
         Check if HTML content contains patterns that might cause Docling to crash.
         
         Args:
-            html_file_path: Path to HTML file
+            html_bytes: Raw HTML content
             
         Returns:
             True if content is potentially problematic
         """
         try:
-            with open(html_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = html_bytes.decode('utf-8')
             
             # Check for patterns that commonly cause crashes
             problematic_patterns = [
@@ -344,7 +358,7 @@ class DocumentConverter:
             
             return any(problematic_patterns)
         except Exception:
-            # If we can't read the file, assume it's problematic
+            # If we can't decode the content, assume it's problematic
             return True
     
     def convert_document(self, html_file_path: str, output_format: str) -> Any:
@@ -352,7 +366,7 @@ class DocumentConverter:
         Convert document to specified format.
         
         Args:
-            html_file_path: Path to HTML file to convert
+            html_file_path: Path to HTML file, or a DocumentStream, to convert
             output_format: Target format ('markdown', 'html', 'docx')
             
         Returns:
@@ -399,64 +413,103 @@ class DocumentConverter:
             Tuple of (converted content, conversion_time_seconds, fallback_message)
             fallback_message is None if no fallback was used, otherwise contains the fallback reason
         """
-        import time
+        try:
+            with open(html_file_path, 'rb') as f:
+                html_bytes = f.read()
+            return self.convert_bytes(html_bytes, output_format, source_url)
+        finally:
+            self.cleanup_temp_file(html_file_path)
+    
+    def convert_bytes(self, html_bytes: bytes, output_format: str, source_url: str = None) -> tuple:
+        """
+        Convert in-memory HTML, handing it to Docling as a stream instead of a file.
+        
+        Args:
+            html_bytes: UTF-8 encoded HTML content to convert
+            output_format: Target format ('markdown', 'html', 'docx')
+            source_url: Optional source URL to include in markdown header
+            
+        Returns:
+            Tuple of (converted content, conversion_time_seconds, fallback_message)
+            fallback_message is None if no fallback was used, otherwise contains the fallback reason
+        """
+        return self.convert_bytes_to_formats(html_bytes, [output_format], source_url)[0]
+    
+    def convert_bytes_to_formats(self, html_bytes: bytes, output_formats: List[str], source_url: str = None) -> List[tuple]:
+        """
+        Convert in-memory HTML to several formats from a single Docling parse.
+        
+        Args:
+            html_bytes: UTF-8 encoded HTML content to convert
+            output_formats: Target formats ('markdown', 'html', 'docx')
+            source_url: Optional source URL to include in markdown header
+            
+        Returns:
+            One (converted content, conversion_time_seconds, fallback_message) tuple per
+            format, in the order given; fallback_message is None if no fallback was used
+        """
+        exporters = {
+            'markdown': self._export_markdown,
+            'md': self._export_markdown,
+            'html': self._export_html,
+            'docx': self._export_docx
+        }
         start_time = time.time()
         
+        def url_header(output_format: str) -> str:
+            if output_format.lower() in ['markdown', 'md'] and source_url:
+                return f"# Source: {source_url}\n\n---\n\n"
+            return ""
+        
+        def fallback(reason: str) -> List[tuple]:
+            text = self._simple_html_to_text(html_bytes)
+            return [(url_header(fmt) + text, time.time() - start_time, reason) for fmt in output_formats]
+        
+        # Check if Docling is enabled
+        if not self.config.get('enabled', True):
+            # Use simple fallback conversion
+            return fallback("Docling disabled, using simple conversion")
+        
+        # Check size - skip very large documents that might cause crashes
+        file_size = len(html_bytes)
+        max_size_mb = self.config.get('max_file_size_mb', 10)
+        if file_size > max_size_mb * 1024 * 1024:  # Configurable MB limit for Docling
+            # Use simple fallback conversion
+            return fallback(f"File too large for Docling ({file_size / 1024 / 1024:.1f}MB), using fallback")
+        
         try:
-            # Check if Docling is enabled
-            if not self.config.get('enabled', True):
-                # Use simple fallback conversion
-                result = self._simple_html_to_text(html_file_path)
-                if output_format.lower() in ['markdown', 'md'] and source_url:
-                    result = f"# Source: {source_url}\n\n---\n\n" + result
-                conversion_time = time.time() - start_time
-                return result, conversion_time, "Docling disabled, using simple conversion"
-            
-            # Check file size - skip very large files that might cause crashes
-            import os
-            file_size = os.path.getsize(html_file_path)
-            max_size_mb = self.config.get('max_file_size_mb', 10)
-            if file_size > max_size_mb * 1024 * 1024:  # Configurable MB limit for Docling
-                # Use simple fallback conversion
-                result = self._simple_html_to_text(html_file_path)
-                if output_format.lower() in ['markdown', 'md'] and source_url:
-                    result = f"# Source: {source_url}\n\n---\n\n" + result
-                conversion_time = time.time() - start_time
-                return result, conversion_time, f"File too large for Docling ({file_size / 1024 / 1024:.1f}MB), using fallback"
+            # Additional check for potentially problematic content patterns
+            if self._is_problematic_content(html_bytes):
+                return fallback("Detected problematic content patterns, using fallback")
             
+            # Parse once; every format is exported from the same result.
+            # Docling picks the input backend from the stream name's extension
+            stream = DocumentStream(name='page.html', stream=BytesIO(html_bytes))
+            conv_result = self._convert(stream)
+        except Exception as e:
+            conv_result = None
+            parse_error = e
+        parse_time = time.time() - start_time
+        
+        results = []
+        for output_format in output_formats:
+            export_start = time.time()
             try:
-                # Additional check for potentially problematic content patterns
-                if self._is_problematic_content(html_file_path):
-                    result = self._simple_html_to_text(html_file_path)
-                    if output_format.lower() in ['markdown', 'md'] and source_url:
-                        result = f"# Source: {source_url}\n\n---\n\n" + result
-                    conversion_time = time.time() - start_time
-                    return result, conversion_time, "Detected problematic content patterns, using fallback"
-                
-                result = self.convert_document(html_file_path, output_format)
-                
-                # Add URL header for markdown format
-                if output_format.lower() in ['markdown', 'md'] and source_url:
-                    url_header = f"# Source: {source_url}\n\n---\n\n"
-                    result = url_header + result
-                
-                conversion_time = time.time() - start_time
-                return result, conversion_time, None  # No fallback used
+                if conv_result is None:
+                    raise parse_error
+                if output_format.lower() not in exporters:
+                    raise ValueError(f"Unsupported output format: {output_format}")
+                result = url_header(output_format) + exporters[output_format.lower()](conv_result)
+                results.append((result, parse_time + time.time() - export_start, None))  # No fallback used
             except Exception as e:
                 # If Docling fails, use fallback conversion
                 try:
-                    result = self._simple_html_to_text(html_file_path)
-                    if output_format.lower() in ['markdown', 'md'] and source_url:
-                        result = f"# Source: {source_url}\n\n---\n\n" + result
-                    conversion_time = time.time() - start_time
-                    return result, conversion_time, f"Docling conversion failed, using fallback: {str(e)[:100]}"
+                    result = url_header(output_format) + self._simple_html_to_text(html_bytes)
+                    results.append((result, parse_time + time.time() - export_start,
+                                    f"Docling conversion failed, using fallback: {str(e)[:100]}"))
                 except Exception as fallback_error:
                     # Last resort - return error message
                     error_msg = f"[Conversion failed: {str(e)[:100]}]"
-                    conversion_time = time.time() - start_time
-                    if output_format.lower() in ['markdown', 'md'] and source_url:
-                        return f"# Source: {source_url}\n\n---\n\n{error_msg}", conversion_time, f"Both Docling and fallback failed: {str(fallback_error)[:50]}"
-                    return error_msg, conversion_time, f"Both Docling and fallback failed: {str(fallback_error)[:50]}"
-                    
-        finally:
-            self.cleanup_temp_file(html_file_path)
\ No newline at end of file
+                    results.append((url_header(output_format) + error_msg, parse_time + time.time() - export_start,
+                                    f"Both Docling and fallback failed: {str(fallback_error)[:50]}"))
+        return results
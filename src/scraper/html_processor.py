@@ -2,12 +2,49 @@
 HTML processing module for cleaning and processing HTML content.
 """
 
+import os
 import re
 import tempfile
 from typing import Dict, List, Any
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit
 from bs4 import BeautifulSoup
 
+from .file_manager import sanitize_url_for_filename
+
+# Prefer the libxml2-backed parser; fall back to the pure-Python one if lxml is missing
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Elements removed when they contain no text and none of the kept void tags
+_EMPTY_ELEMENT_TAGS = [
+    "div", "p", "span", "section", "article", "aside", "main",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li",
+    "nav", "header", "footer", "figure", "figcaption", "blockquote",
+    "pre", "code", "em", "strong", "small", "mark", "del", "ins",
+    "sub", "sup", "i", "b", "u", "s", "q", "cite", "abbr", "dfn",
+    "time", "var", "samp", "kbd", "address", "dt", "dd", "dl"
+]
+_KEEP_VOID_TAGS = ['img', 'input', 'br', 'hr']
+
+# CSS rules hiding their selectors, and the pseudo-classes/elements stripped from those selectors
+_HIDDEN_RULE_RE = re.compile(
+    r'([^{}]+)\{[^}]*(?:display\s*:\s*none|visibility\s*:\s*hidden)[^}]*\}',
+    re.IGNORECASE
+)
+_PSEUDO_SELECTOR_RE = re.compile(
+    r':(?:hover|focus|active|visited|before|after|first-child|last-child|nth-child\([^)]+\))'
+)
+
+# Raw-text patterns for whole <script>/<style> elements, case-insensitive within an alternation
+_SCRIPT_PATTERN = r'(?i:<script\b[^>]*>.*?</script\s*>)'
+_STYLE_PATTERN = r'(?i:<style\b[^>]*>.*?</style\s*>)'
+
+# Markdown links: [text](url)
+_MARKDOWN_LINK_RE = re.compile(r'\[[^\]]+\]\([^)]+\)')
+
 
 class HTMLProcessor:
     """Handles HTML cleaning and link processing operations."""
@@ -25,6 +62,78 @@ class HTMLProcessor:
         self.image_extensions = tuple(config.get('exclude_image_extensions', []))
         self.exclude_section_urls = config.get('exclude_section_urls', True)
         self.convert_relative_to_absolute = config.get('convert_relative_to_absolute', True)
+        # Cleaning rules keyed by the domain's rule fields (see _rules_key), so per-page default
+        # configs for unconfigured domains share one entry
+        self._clean_cache: Dict[tuple, tuple] = {}
+    
+    @staticmethod
+    def _rules_key(domain_config: Dict[str, Any]) -> tuple:
+        """
+        Build a hashable key from the domain config fields that affect cleaning.
+        
+        Args:
+            domain_config: Domain-specific configuration
+            
+        Returns:
+            Tuple of the domain's elements, classes, comment blocks and only-include selectors
+        """
+        return (
+            tuple(domain_config.get('html_elements_to_remove', []) or []),
+            tuple(domain_config.get('html_classes_to_remove', []) or []),
+            tuple(tuple(block) for block in domain_config.get('comment_blocks_to_remove', []) or []),
+            tuple(domain_config.get('html_classes_to_only_include', []) or []),
+        )
+    
+    def _get_cleaning_rules(self, domain_config: Dict[str, Any]) -> tuple:
+        """
+        Get the merged global and domain cleaning rules, building them on first use.
+        
+        Args:
+            domain_config: Domain-specific configuration
+            
+        Returns:
+            Tuple of (raw-text strip regex or None, element tag list, combined class selector,
+            only-include selectors, remove CSS hidden elements flag, remove empty elements flag);
+            every entry is falsy when no cleaning applies
+        """
+        key = self._rules_key(domain_config)
+        rules = self._clean_cache.get(key)
+        if rules is not None:
+            return rules
+        
+        # Combine global and domain-specific elements and classes, deduplicated
+        global_elements = self.global_html_cleaning.get('html_elements_to_remove', [])
+        domain_elements = domain_config.get('html_elements_to_remove', []) or []
+        all_elements = list(dict.fromkeys(global_elements + domain_elements))
+        global_classes = self.global_html_cleaning.get('html_classes_to_remove', [])
+        domain_classes = domain_config.get('html_classes_to_remove', []) or []
+        remove_css_hidden = self.global_html_cleaning.get('remove_css_hidden_elements', True)
+        
+        # Combine global and domain-specific comment blocks into one alternation
+        global_comment_blocks = self.global_html_cleaning.get('comment_blocks_to_remove', [])
+        domain_comment_blocks = domain_config.get('comment_blocks_to_remove', []) or []
+        strip_patterns = [
+            f'{re.escape(start)}.*?{re.escape(end)}'
+            for start, end in global_comment_blocks + domain_comment_blocks
+        ]
+        # Script and style bodies that would be removed anyway are cut from the raw text,
+        # so the parser never sees them; <style> must survive for CSS-hidden detection
+        if 'script' in all_elements:
+            strip_patterns.append(_SCRIPT_PATTERN)
+        if 'style' in all_elements and not remove_css_hidden:
+            strip_patterns.append(_STYLE_PATTERN)
+        strip_re = re.compile('|'.join(strip_patterns), re.DOTALL) if strip_patterns else None
+        
+        rules = (
+            strip_re,
+            all_elements,
+            ', '.join(dict.fromkeys(global_classes + domain_classes)),
+            tuple(domain_config.get('html_classes_to_only_include', []) or []),
+            remove_css_hidden,
+            self.global_html_cleaning.get('remove_empty_elements', True),
+        )
+        self._clean_cache[key] = rules
+        return rules
     
     def clean_html_content(self, html_content: str, domain_config: Dict[str, Any]) -> str:
         """
@@ -37,72 +146,63 @@ class HTMLProcessor:
         Returns:
             Cleaned HTML content
         """
-        # Combine global and domain-specific comment blocks
-        global_comment_blocks = self.global_html_cleaning.get('comment_blocks_to_remove', [])
-        domain_comment_blocks = domain_config.get('comment_blocks_to_remove', []) or []
-        all_comment_blocks = global_comment_blocks + domain_comment_blocks
+        # Nothing to remove: skip the parse/serialize round trip
+        if not any(self._get_cleaning_rules(domain_config)):
+            return html_content
+        return str(self._clean_soup(html_content, domain_config))
+    
+    def _clean_soup(self, html_content: str, domain_config: Dict[str, Any]) -> BeautifulSoup:
+        """
+        Parse HTML content and clean it as described in clean_html_content.
         
-        # Remove comment blocks first
-        for start_comment, end_comment in all_comment_blocks:
-            start_escaped = re.escape(start_comment)
-            end_escaped = re.escape(end_comment)
-            pattern = f'{start_escaped}.*?{end_escaped}'
-            html_content = re.sub(pattern, '', html_content, flags=re.DOTALL)
+        Args:
+            html_content: HTML content to clean
+            domain_config: Domain-specific configuration
+            
+        Returns:
+            Cleaned BeautifulSoup tree
+        """
+        (strip_re, all_elements_to_remove, class_selector,
+         classes_to_only_include, remove_css_hidden, remove_empty) = self._get_cleaning_rules(domain_config)
+        
+        # Remove comment blocks (and pre-strippable script/style elements) first
+        if strip_re is not None:
+            html_content = strip_re.sub('', html_content)
         
         # Parse with BeautifulSoup for element removal
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Remove elements hidden by CSS styles (non-inline) if enabled
         # THIS MUST RUN FIRST before removing <style> tags
-        if self.global_html_cleaning.get('remove_css_hidden_elements', True):
+        if remove_css_hidden:
             self._remove_css_hidden_elements(soup)
         
-        # Combine global and domain-specific elements to remove
-        global_elements = self.global_html_cleaning.get('html_elements_to_remove', [])
-        domain_elements = domain_config.get('html_elements_to_remove', []) or []
-        all_elements_to_remove = list(set(global_elements + domain_elements))
-        
-        # Remove unwanted HTML elements
-        for element_tag in all_elements_to_remove:
-            for element in soup.find_all(element_tag):
-                element.decompose()
-        
-        # Combine global and domain-specific classes to remove
-        global_classes = self.global_html_cleaning.get('html_classes_to_remove', [])
-        domain_classes = domain_config.get('html_classes_to_remove', []) or []
-        all_classes_to_remove = list(set(global_classes + domain_classes))
-        
-        # Remove elements by CSS class selectors
-        for class_selector in all_classes_to_remove:
+        # Remove unwanted HTML elements and elements matching the CSS class selectors,
+        # one tree walk each; skip matches nested inside an already removed element
+        if all_elements_to_remove:
+            for element in soup.find_all(all_elements_to_remove):
+                if not element.decomposed:
+                    element.decompose()
+        if class_selector:
             for element in soup.select(class_selector):
-                element.decompose()
+                if not element.decomposed:
+                    element.decompose()
         
         # Apply domain-specific "only include" filter if specified
-        classes_to_only_include = domain_config.get('html_classes_to_only_include', [])
         if classes_to_only_include:
             self._apply_only_include_filter(soup, classes_to_only_include)
         
-        # Remove empty elements by default (multiple passes to handle nested empty elements)
-        default_empty_elements = [
-            "div", "p", "span", "section", "article", "aside", "main",
-            "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li",
-            "nav", "header", "footer", "figure", "figcaption", "blockquote",
-            "pre", "code", "em", "strong", "small", "mark", "del", "ins",
-            "sub", "sup", "i", "b", "u", "s", "q", "cite", "abbr", "dfn",
-            "time", "var", "samp", "kbd", "address", "dt", "dd", "dl"
-        ]
-        
-        changed = True
-        while changed:
-            changed = False
-            for element_tag in default_empty_elements:
-                for element in soup.find_all(element_tag):
-                    # Check if element is empty
-                    if not element.get_text(strip=True) and not element.find_all(['img', 'input', 'br', 'hr']):
-                        element.decompose()
-                        changed = True
+        # Remove empty elements by default. One document-order pass is enough: removing an
+        # empty element never makes an ancestor emptier, and an element with no text and no
+        # kept void tags has only empty descendants, which go with it (skipped once decomposed)
+        if remove_empty:
+            for element in soup.find_all(_EMPTY_ELEMENT_TAGS):
+                if element.decomposed:
+                    continue
+                if not element.get_text(strip=True) and not element.find(_KEEP_VOID_TAGS):
+                    element.decompose()
         
-        return str(soup)
+        return soup
     
     def _remove_css_hidden_elements(self, soup: BeautifulSoup) -> None:
         """
@@ -111,46 +211,41 @@ class HTMLProcessor:
         Args:
             soup: BeautifulSoup object to process
         """
-        # Extract CSS rules from <style> tags
-        css_rules = []
-        for style_tag in soup.find_all('style'):
-            if style_tag.string:
-                css_rules.append(style_tag.string)
-        
-        # Join all CSS content
-        css_content = ' '.join(css_rules)
-        
-        # Simple regex patterns to find hidden selectors
-        # This is a basic implementation - CSS parsing can be complex
-        hidden_patterns = [
-            r'([^{]+)\s*\{\s*[^}]*display\s*:\s*none[^}]*\}',
-            r'([^{]+)\s*\{\s*[^}]*visibility\s*:\s*hidden[^}]*\}',
-        ]
+        # Join CSS content from all <style> tags
+        css_content = ' '.join(style_tag.string for style_tag in soup.find_all('style') if style_tag.string)
+        if not css_content:
+            return
         
+        # Simple regex to find hidden selectors; this is a basic implementation,
+        # CSS parsing can be complex
         hidden_selectors = []
-        for pattern in hidden_patterns:
-            matches = re.findall(pattern, css_content, re.IGNORECASE)
-            for match in matches:
-                # Clean up the selector
-                selector = match.strip().replace('\n', ' ')
-                # Split by comma for multiple selectors
-                selectors = [s.strip() for s in selector.split(',')]
-                hidden_selectors.extend(selectors)
-        
-        # Remove elements matching hidden selectors
-        for selector in hidden_selectors:
-            try:
-                # Basic selector cleanup - remove pseudo-classes and pseudo-elements
-                clean_selector = re.sub(r':(hover|focus|active|visited|before|after|first-child|last-child|nth-child\([^)]+\))', '', selector)
-                clean_selector = clean_selector.strip()
-                
+        for match in _HIDDEN_RULE_RE.findall(css_content):
+            # Split by comma for multiple selectors and drop pseudo-classes/elements
+            for selector in match.replace('\n', ' ').split(','):
+                clean_selector = _PSEUDO_SELECTOR_RE.sub('', selector).strip()
                 if clean_selector:
-                    elements = soup.select(clean_selector)
-                    for element in elements:
-                        element.decompose()
-            except Exception:
-                # If selector is invalid, skip it
-                continue
+                    hidden_selectors.append(clean_selector)
+        if not hidden_selectors:
+            return
+        hidden_selectors = list(dict.fromkeys(hidden_selectors))
+        
+        # Match all selectors in one pass; a single invalid selector fails the whole
+        # group, in which case fall back to matching them one by one
+        try:
+            elements = soup.select(', '.join(hidden_selectors))
+        except Exception:
+            elements = []
+            for selector in hidden_selectors:
+                try:
+                    elements.extend(soup.select(selector))
+                except Exception:
+                    # If selector is invalid, skip it
+                    continue
+        
+        for element in elements:
+            # Skip descendants of an element that was already removed
+            if not element.decomposed:
+                element.decompose()
     
     def _apply_only_include_filter(self, soup: BeautifulSoup, classes_to_only_include: List[str]) -> None:
         """
@@ -161,46 +256,45 @@ class HTMLProcessor:
             soup: BeautifulSoup object to process
             classes_to_only_include: List of class selectors to keep exclusively
         """
-        # Check if any of the specified classes exist
-        elements_found = []
-        for class_selector in classes_to_only_include:
-            try:
-                elements = soup.select(class_selector)
-                elements_found.extend(elements)
-            except Exception:
-                # If selector is invalid, skip it
-                continue
+        # Find elements matching the specified classes, in document order
+        try:
+            elements_found = soup.select(', '.join(classes_to_only_include))
+        except Exception:
+            # One invalid selector fails the whole group; match them individually instead
+            elements_found = []
+            for class_selector in classes_to_only_include:
+                try:
+                    elements_found.extend(soup.select(class_selector))
+                except Exception:
+                    # If selector is invalid, skip it
+                    continue
         
         # If no elements found with specified classes, ignore this rule
         if not elements_found:
             return
         
-        # Get the body element or create one if it doesn't exist
+        # Get the body element or fall back to the whole document
         body = soup.find('body')
         if not body:
             body = soup
         
-        # Collect all elements to keep (the specified classes and their descendants)
-        elements_to_keep = set()
+        # Keep the matches, their descendants, and their ancestors up to the body, so kept
+        # cells and list items retain their table/list context. Tags hash by their
+        # serialized markup, so track identity with id() instead
+        keep_ids = set()
         for element in elements_found:
-            # Add the element itself
-            elements_to_keep.add(element)
-            # Add all its descendants
-            for descendant in element.find_all():
-                elements_to_keep.add(descendant)
-            # Add all its parents up to body
+            keep_ids.add(id(element))
+            keep_ids.update(id(descendant) for descendant in element.find_all())
             parent = element.parent
-            while parent and parent != body:
-                elements_to_keep.add(parent)
+            while parent is not None and parent is not body and id(parent) not in keep_ids:
+                keep_ids.add(id(parent))
                 parent = parent.parent
         
-        # Remove all elements not in the keep set
-        elements_to_remove = []
-        for element in body.find_all():
-            if element not in elements_to_keep:
-                elements_to_remove.append(element)
-        
-        # Remove elements that are not in the keep list
+        # Remove the outermost elements outside the keep set; their descendants go with them
+        elements_to_remove = [
+            element for element in body.find_all()
+            if id(element) not in keep_ids and (element.parent is body or id(element.parent) in keep_ids)
+        ]
         for element in elements_to_remove:
             element.decompose()
     
@@ -215,7 +309,22 @@ class HTMLProcessor:
         Returns:
             HTML content with processed links
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        self._process_links_in_soup(soup, base_url)
+        return str(soup)
+    
+    def _process_links_in_soup(self, soup: BeautifulSoup, base_url: str) -> None:
+        """
+        Convert anchor tags in a parsed tree to markdown links, in place.
+        
+        Args:
+            soup: BeautifulSoup tree to process
+            base_url: Base URL for resolving relative links
+        """
+        # Root-relative hrefs (the common case) resolve against the origin without urljoin;
+        # anything with dot segments or a protocol-relative prefix still goes through urljoin
+        base_parts = urlsplit(base_url)
+        origin = f"{base_parts.scheme}://{base_parts.netloc}"
         
         # Replace anchor tags with markdown link format
         for a_tag in soup.find_all('a', href=True):
@@ -232,7 +341,10 @@ class HTMLProcessor:
                 # Convert relative URLs to absolute
                 if (self.convert_relative_to_absolute and 
                     not href.startswith(('http://', 'https://', 'mailto:', 'tel:'))):
-                    href = urljoin(base_url, href)
+                    if href.startswith('/') and not href.startswith('//') and '/.' not in href:
+                        href = origin + href
+                    else:
+                        href = urljoin(base_url, href)
                 
                 # Skip URLs with section fragments if configured
                 if self.exclude_section_urls and '#' in href:
@@ -250,8 +362,6 @@ class HTMLProcessor:
             else:
                 # If no href or text, just replace with text
                 a_tag.replace_with(text if text else '')
-        
-        return str(soup)
     
     def _is_markdown_link(self, text: str) -> bool:
         """
@@ -263,12 +373,10 @@ class HTMLProcessor:
         Returns:
             True if text contains markdown links
         """
-        import re
-        
-        # Pattern to match markdown links: [text](url)
-        markdown_link_pattern = r'\[([^\]]+)\]\(([^)]+)\)'
-        
-        return bool(re.search(markdown_link_pattern, text))
+        # Most anchor texts have no "](" at all, so skip the regex for them
+        if '](' not in text:
+            return False
+        return _MARKDOWN_LINK_RE.search(text) is not None
     
     def create_temp_html_file(self, html_content: str) -> str:
         """
@@ -280,13 +388,36 @@ class HTMLProcessor:
         Returns:
             Path to the temporary file
         """
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.html') as temp_file:
-            temp_file.write(html_content.encode('utf-8'))
-            return temp_file.name
+        return self.materialize_temp(html_content.encode('utf-8'))
+    
+    def materialize_temp(self, html_bytes: bytes) -> str:
+        """
+        Write encoded HTML to a temporary file, for consumers that need a filesystem path.
+        
+        Args:
+            html_bytes: UTF-8 encoded HTML content
+            
+        Returns:
+            Path to the temporary file (the caller is responsible for deleting it)
+        """
+        fd, path = tempfile.mkstemp(suffix='.html')
+        try:
+            # Reserve the full size up front where supported (Linux), then write unbuffered
+            if html_bytes and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(fd, 0, len(html_bytes))
+                except OSError:
+                    pass
+            view = memoryview(html_bytes)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        return path
     
     def process_html(self, html_content: str, base_url: str, domain_config: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Process HTML content through the full pipeline.
+        Process HTML content through the full pipeline, entirely in memory.
         
         Args:
             html_content: Raw HTML content
@@ -294,21 +425,19 @@ class HTMLProcessor:
             domain_config: Domain-specific configuration
             
         Returns:
-            Dictionary containing processed HTML and temp file path
+            Dictionary containing the processed HTML ('processed_html') and its UTF-8
+            encoded bytes ('bytes'); use materialize_temp if a file path is needed
         """
-        # Step 1: Clean HTML content
-        cleaned_html = self.clean_html_content(html_content, domain_config)
-        
-        # Step 2: Process links
-        processed_html = self.process_links_in_html(cleaned_html, base_url)
+        # Step 1: Parse and clean HTML content
+        soup = self._clean_soup(html_content, domain_config)
         
-        # Step 3: Create temporary file for conversion
-        temp_file_path = self.create_temp_html_file(processed_html)
+        # Step 2: Process links on the same tree, serializing only once
+        self._process_links_in_soup(soup, base_url)
+        processed_html = str(soup)
         
         return {
-            'cleaned_html': cleaned_html,
             'processed_html': processed_html,
-            'temp_file_path': temp_file_path
+            'bytes': processed_html.encode('utf-8')
         }
     
     def sanitize_filename(self, url: str) -> str:
@@ -321,21 +450,4 @@ class HTMLProcessor:
         Returns:
             Safe filename
         """
-        # Remove protocol
-        filename = url.replace('https://', '').replace('http://', '')
-        
-        # Replace invalid characters for Windows filenames
-        invalid_chars = r'[<>:"|?*\\/]'
-        filename = re.sub(invalid_chars, '_', filename)
-        
-        # Replace multiple underscores with single underscore
-        filename = re.sub(r'_+', '_', filename)
-        
-        # Remove leading/trailing underscores
-        filename = filename.strip('_')
-        
-        # Ensure filename isn't too long (Windows has 260 char limit for full path)
-        if len(filename) > 200:
-            filename = filename[:200]
-        
-        return filename
\ No newline at end of file
+        return sanitize_url_for_filename(url)
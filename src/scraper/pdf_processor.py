@@ -3,6 +3,7 @@ PDF processor module for downloading and extracting PDF content.
 """
 
 import os
+import threading
 import requests
 from typing import Dict, Any, Optional, List
 from urllib.parse import urlparse, unquote
@@ -26,6 +27,8 @@ class PDFProcessor:
         self.docling_config = docling_config or {}
         self.process_pdf_links = config.get('process_pdf_links', True)
         self.converter = DoclingConverter()
+        # Downloads may run in parallel threads; Docling conversions are serialized
+        self._convert_lock = threading.Lock()
     
     def is_pdf_url(self, url: str) -> bool:
         """
@@ -110,7 +113,8 @@ class PDFProcessor:
         """
         try:
             # Try to convert PDF using Docling
-            conv_result = self.converter.convert(pdf_path)
+            with self._convert_lock:
+                conv_result = self.converter.convert(pdf_path)
             
             if output_format.lower() in ['markdown', 'md']:
                 # Get markdown settings from docling config
@@ -22,7 +22,12 @@ from bs4 import BeautifulSoup
 
 
 class WebCrawler:
-    """Handles web crawling operations using Crawl4AI."""
+    """
+    Handles web crawling operations using Crawl4AI.
+    
+    ``failed_urls`` is always initialized to a list, so callers can read it
+    directly without checking for the attribute.
+    """
     
     def __init__(self, config: Dict[str, Any], progress_formatter=None):
         """
@@ -40,6 +45,9 @@ class WebCrawler:
         self.raw_html_cache = {}  # Cache for raw HTML to avoid re-fetching
         self.progress_formatter = progress_formatter
         self.semantic_queue_callback = None  # Callback to get semantic queue for checkpointing
+        # Pages yielded by crawl_all_streaming that the consumer has not saved yet (ordered);
+        # checkpoints keep them queued instead of visited
+        self.unsaved_urls = {}
         
     async def __aenter__(self):
         """Async context manager entry."""
@@ -595,6 +603,10 @@ class WebCrawler:
         with open('crawler_checkpoint.json', 'w', encoding='utf-8') as f:
             json.dump(checkpoint, f, indent=2)
     
+    def mark_page_saved(self, url: str) -> None:
+        """Record that a yielded page was processed, so the next checkpoint counts it as visited."""
+        self.unsaved_urls.pop(url, None)
+    
     def load_checkpoint(self):
         """Load crawling checkpoint if exists."""
         import json
@@ -663,6 +675,7 @@ class WebCrawler:
             
             # Mark URL as visited NOW that we're actually crawling it
             self.visited_urls.add(url)
+            self.unsaved_urls[url] = None
             
             # Log crawling start through progress formatter
             if self.progress_formatter:
@@ -684,6 +697,7 @@ class WebCrawler:
             result = await self.crawl_page_two_phase(url, domain_config, allowed_domains, domains)
             if result:
                 # Add queue size info for orchestrator
+                result['crawl_url'] = url  # Passed back to mark_page_saved
                 result['queue_size'] = len(self.queue)
                 result['pages_crawled'] = pages_crawled
                 
@@ -704,7 +718,13 @@ class WebCrawler:
                             semantic_queue = self.semantic_queue_callback()
                         except Exception as e:
                             print(f"⚠️ Could not get semantic queue for checkpoint: {e}")
-                    self.save_checkpoint(self.visited_urls, self.queue, semantic_queue)
+                    # Pages still buffered for the consumer are checkpointed as queued, so a
+                    # crash re-crawls them instead of skipping them as done
+                    self.save_checkpoint(
+                        self.visited_urls - self.unsaved_urls.keys(),
+                        deque([*self.unsaved_urls, *self.queue]),
+                        semantic_queue
+                    )
                 
                 # Get links from the two-phase result (already extracted from raw HTML)
                 if pages_crawled < max_pages:
@@ -735,6 +755,7 @@ class WebCrawler:
                 # Yield result immediately for processing
                 yield result
             else:
+                self.unsaved_urls.pop(url, None)
                 print(f"   ❌ Failed to crawl: {url}")
         
         if pages_crawled >= max_pages: